@@ -0,0 +1,18 @@
+"""Generated from requirements.txt by scripts/freeze_requirements.py; do not edit"""
+
+INSTALL_REQUIRES = (
+    'streamlit==1.32.2',
+    'streamlit-folium==0.20.0',
+    'folium==0.15.1',
+    'geopandas==0.14.3',
+    'duckdb==0.10.2',
+    'rasterio==1.3.9',
+    'plotly==5.22.0',
+    'numpy==1.26.4',
+    'pandas==2.2.2',
+    'matplotlib==3.8.3',
+    'scikit-image==0.22.0',
+    'scikit-learn==1.4.2',
+    'pillow==10.3.0',
+    'requests==2.31.0',
+)
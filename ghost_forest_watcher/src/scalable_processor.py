@@ -4,127 +4,428 @@ Handles memory-efficient processing of massive fire areas through intelligent ti
 """
 import numpy as np
 import rasterio
+import torch
+from rasterio.features import geometry_mask
+from rasterio.transform import Affine
 from rasterio.windows import Window
 from pathlib import Path
 import json
-from typing import Dict, List, Tuple, Generator
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Optional, Tuple, Generator
+import itertools
 import logging
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import ExitStack, nullcontext
 import psutil
 import math
+import functools
+import multiprocessing
+import multiprocessing.util
+import threading
+from multiprocessing import shared_memory
 from dataclasses import dataclass
 from tqdm import tqdm
 
-from .sam_processor import ForestSAMProcessor
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .sam_processor import ForestSAMProcessor, MASK_NAMES
+from .tile_reader import TileReader
 
 # =====================
 # Top-level worker API
 # =====================
 
+# Workers fork from a forkserver that has already imported the heavy C
+# extensions, so each worker inherits them copy-on-write instead of
+# re-importing torch/rasterio/SAM. forkserver is POSIX-only; Windows spawns.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context("forkserver")
+    _MP_CONTEXT.set_forkserver_preload(["numpy", "torch", "rasterio", "segment_anything"])
+else:  # pragma: no cover - platform specific
+    _MP_CONTEXT = multiprocessing.get_context("spawn")
+
 _GLOBAL_SAM_PROCESSOR = None
+_GLOBAL_INPUT_PATH = None
+_GLOBAL_OUTPUT_DIR = None
+_GLOBAL_WRITE_LOCK = None
+_GLOBAL_SAM_LOCK = None
+_THREAD_STATE = threading.local()
+_GLOBAL_SRC = None
+_GLOBAL_SRC_PATH = None
+_GLOBAL_TILE_READER = None
+
+# Per-tile statistics summed by ScalableForestProcessor.process_large_area;
+# total_vegetation_pixels must stay last
+_AGGREGATE_CLASSES = ('healthy', 'stressed', 'declining', 'dead')
+_AGGREGATE_KEYS = tuple(f'{category}_pixels' for category in _AGGREGATE_CLASSES) + (
+    'total_vegetation_pixels',
+)
+
+# Run-wide outputs: every worker writes its tile windows into these
+NDVI_MOSAIC_NAME = "ndvi.tif"
+MASKS_MOSAIC_NAME = "masks.tif"  # one uint8 band per MASK_NAMES entry
+ALL_TILE_STATS_NAME = "all_tile_stats.jsonl"
+MOSAIC_BLOCK_SIZE = 512
+
+# Priority scoring and nodata skipping work on a grid of
+# PRIORITY_DECIMATION x PRIORITY_DECIMATION pixel cells
+PRIORITY_DECIMATION = 16
+# Approximate size of each full-resolution read while building that grid
+VALID_MASK_READ_BYTES = 64 * 1024**2
+
+# Tiles with less valid data than this (by coarse cells) are skipped, not segmented
+MIN_VALID_FRACTION = 0.01
+NODATA_PRIORITY = 4
+
+# Peak RSS of a CPU worker: the loaded vit_b model, plus the image encoder's
+# activations (e.g. the (heads, 4096, 4096) float32 attention bias of each
+# global-attention block) for every image of a batch
+WORKER_BASE_MEMORY_GB = 1.2
+WORKER_IMAGE_MEMORY_GB = 1.8
+
+
+def _hilbert_index(n: int, x: int, y: int) -> int:
+    """Distance of cell (x, y) along a Hilbert curve filling an n x n grid.
+
+    ``n`` is rounded up to a power of two; cells outside the real grid just
+    leave gaps in the sequence.
+    """
+    side = 1 << max(0, (n - 1).bit_length())
+    d = 0
+    s = side // 2
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the sub-curve is in standard orientation
+        if ry == 0:
+            if rx == 1:
+                x = side - 1 - x
+                y = side - 1 - y
+            x, y = y, x
+        s //= 2
+    return d
 
-def _init_worker(model_type: str = "vit_b") -> None:
+
+@functools.lru_cache(maxsize=8)
+def _get_utm_transformer(src_crs_wkt: str):
+    """Transformer from src_crs_wkt to UTM Zone 13N, built once per CRS"""
+    from pyproj import CRS, Transformer
+
+    # Use UTM zone for Colorado (approximately Zone 13N)
+    return Transformer.from_crs(CRS.from_wkt(src_crs_wkt), CRS.from_epsg(32613), always_xy=True)
+
+
+def _init_worker(
+    model_type: str = "vit_b",
+    input_path: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    write_lock=None,
+    sam_lock=None,
+    checkpoint_path: Optional[str] = None,
+) -> None:
     """Initializer for worker processes to create a local SAM processor.
 
-    Avoids pickling model objects by instantiating per-process.
+    Avoids pickling model objects by instantiating per-process. The input
+    and output paths are the same for every tile of a run, so they are
+    shipped once here instead of with each job. ``write_lock`` serializes
+    window writes into the shared output mosaics; ``sam_lock`` serializes
+    use of the (stateful) SAM predictor when several threads share it.
+    ``checkpoint_path`` is the weights file the parent resolved.
     """
-    global _GLOBAL_SAM_PROCESSOR
+    global _GLOBAL_SAM_PROCESSOR, _GLOBAL_INPUT_PATH, _GLOBAL_OUTPUT_DIR
+    global _GLOBAL_WRITE_LOCK, _GLOBAL_SAM_LOCK
+    _GLOBAL_INPUT_PATH = input_path
+    _GLOBAL_OUTPUT_DIR = output_dir
+    _GLOBAL_WRITE_LOCK = write_lock
+    _GLOBAL_SAM_LOCK = sam_lock
     _GLOBAL_SAM_PROCESSOR = ForestSAMProcessor(model_type=model_type)
-    _GLOBAL_SAM_PROCESSOR.load_model()
+    _GLOBAL_SAM_PROCESSOR.load_model(checkpoint_path=checkpoint_path)
+
+
+def _init_worker_from_file(init_path: str, write_lock=None) -> None:
+    """Pool initializer that loads the pickled ``_init_worker`` keyword arguments.
+
+    The parent serializes the run-wide arguments once into ``init_path``;
+    each worker only receives the short path (plus the lock, which has to
+    travel through process creation).
+    """
+    with open(init_path, "rb") as f:
+        kwargs = pickle.load(f)
+    _init_worker(**kwargs, write_lock=write_lock)
+
+    # Pool workers leave via os._exit, which skips atexit; multiprocessing
+    # finalizers still run on worker shutdown
+    multiprocessing.util.Finalize(None, _close_worker_dataset, exitpriority=10)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """Shut a process pool down without waiting for its running tasks.
 
+    ``shutdown(wait=True)`` would block on a stalled worker until its task
+    finishes, so the worker processes are terminated instead.
+    """
+    if hasattr(executor, "terminate_workers"):  # Python 3.14+
+        executor.terminate_workers()
+        return
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _close_worker_dataset() -> None:
+    """Close this process's cached dataset handle and tile reader"""
+    global _GLOBAL_SRC, _GLOBAL_SRC_PATH, _GLOBAL_TILE_READER
+    if _GLOBAL_TILE_READER is not None:
+        _GLOBAL_TILE_READER.close()
+    if _GLOBAL_SRC is not None:
+        _GLOBAL_SRC.close()
+    _GLOBAL_SRC = _GLOBAL_SRC_PATH = _GLOBAL_TILE_READER = None
+
+
+def _reset_worker_globals() -> None:
+    """Undo ``_init_worker`` in a process that ran it for itself.
+
+    Releases the SAM model (and its cached GPU memory), the dataset handle
+    and the locks, so nothing outlives the run.
+    """
+    global _GLOBAL_SAM_PROCESSOR, _GLOBAL_INPUT_PATH, _GLOBAL_OUTPUT_DIR
+    global _GLOBAL_WRITE_LOCK, _GLOBAL_SAM_LOCK
+    _close_worker_dataset()
+    _GLOBAL_SAM_PROCESSOR = _GLOBAL_INPUT_PATH = _GLOBAL_OUTPUT_DIR = None
+    _GLOBAL_WRITE_LOCK = _GLOBAL_SAM_LOCK = None
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def _get_tile_reader(input_path: str) -> TileReader:
+    """Return this process's TileReader for input_path.
+
+    The dataset is opened (header/IFD parse, CRS/transform init) once per
+    worker and reused for every tile it processes.
+    """
+    global _GLOBAL_SRC, _GLOBAL_SRC_PATH, _GLOBAL_TILE_READER
+    if _GLOBAL_SRC is None or _GLOBAL_SRC_PATH != input_path:
+        _close_worker_dataset()
+        _GLOBAL_SRC = rasterio.open(input_path, sharing=False)
+        _GLOBAL_SRC_PATH = input_path
+        _GLOBAL_TILE_READER = TileReader(input_path, src=_GLOBAL_SRC)
+    return _GLOBAL_TILE_READER
 
-def _process_tile_worker(
-    input_path: str,
-    output_dir: str,
+
+def _release_shared_block(shm: Optional[shared_memory.SharedMemory]) -> None:
+    """Close and unlink a tile's shared memory block (parent side)"""
+    if shm is None:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _chunked(items: List, size: int) -> Generator[List, None, None]:
+    """Yield consecutive lists of at most ``size`` items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _load_tile(tile_job: Dict) -> Tuple[np.ndarray, Optional[shared_memory.SharedMemory]]:
+    """Return a tile's pixels and its attached shared memory block (if any).
+
+    If the job carries "shm"/"shape"/"dtype", the tile pixels were already
+    read by the parent into that shared memory block and are used in place
+    instead of being read from disk. Jobs run in the parent's own threads
+    carry the array itself as "data". Only jobs with neither open this
+    process's reader on the input GeoTIFF.
+    """
+    col_off, row_off, width, height = tile_job["window"]
+    window = Window(col_off, row_off, width, height)
+
+    if "data" in tile_job:
+        return tile_job["data"], None
+    if "shm" in tile_job:
+        shm = shared_memory.SharedMemory(name=tile_job["shm"])
+        return np.ndarray(tile_job["shape"], dtype=tile_job["dtype"], buffer=shm.buf), shm
+    return _get_tile_reader(_GLOBAL_INPUT_PATH).read(window), None
+
+
+def _save_tile_outputs(
     tile_job: Dict,
+    tile_data: np.ndarray,
+    classification_results: Dict,
 ) -> Dict:
-    """Process a single tile in a separate process.
+    """Write a tile's core NDVI and masks into the run mosaics and return its
+    result dict (the parent writes all tiles' statistics in one file)"""
+    output_dir = Path(_GLOBAL_OUTPUT_DIR)
+    core_window = Window(*tile_job["core_window"])
+    core_rows, core_cols = _core_slices(Window(*tile_job["window"]), core_window)
+    masks = _stack_masks(classification_results["masks"])
 
-    Args:
-        input_path: Path to input GeoTIFF (string for pickling ease)
-        output_dir: Base output directory (string)
-        tile_job: Serializable dict describing the tile window and metadata
+    # One writer at a time: each r+ open must see the previous writer's blocks
+    lock = _GLOBAL_WRITE_LOCK if _GLOBAL_WRITE_LOCK is not None else nullcontext()
+    with lock:
+        with rasterio.open(output_dir / NDVI_MOSAIC_NAME, "r+") as dst:
+            dst.write(tile_data[:, core_rows, core_cols], window=core_window)
+        with rasterio.open(output_dir / MASKS_MOSAIC_NAME, "r+") as dst:
+            dst.write(masks, window=core_window)
 
-    Returns:
-        Result dictionary similar to the previous implementation
+    return {
+        "tile_id": tile_job["id"],
+        "status": "completed",
+        "statistics": classification_results["statistics"],
+        "area_km2": tile_job["area_km2"],
+        "bounds": tile_job["bounds"],
+    }
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _inference_stream():
+    """Run this thread's GPU work on its own CUDA stream (no-op off CUDA).
+
+    Lets one thread's uploads and colorization overlap another thread's
+    SAM forward pass.
     """
-    try:
-        # Re-open dataset in worker
-        with rasterio.open(input_path) as src:
-            # Reconstruct window
-            col_off, row_off, width, height = tile_job["window"]
-            window = Window(col_off, row_off, width, height)
-
-            tile_data = src.read(window=window)
-            tile_transform = rasterio.windows.transform(window, src.transform)
-
-            tile_profile = src.profile.copy()
-            tile_profile.update(
-                {
-                    "height": window.height,
-                    "width": window.width,
-                    "transform": tile_transform,
-                }
-            )
+    if _GLOBAL_SAM_PROCESSOR.device != "cuda":
+        return nullcontext()
+    if getattr(_THREAD_STATE, "stream", None) is None:
+        _THREAD_STATE.stream = torch.cuda.Stream()
+    return torch.cuda.stream(_THREAD_STATE.stream)
 
-        # Use per-process SAM processor
-        if _GLOBAL_SAM_PROCESSOR is None:
-            # Fallback: initialize lazily if initializer wasn't used
-            _init_worker("vit_b")
 
-        rgb_image = _GLOBAL_SAM_PROCESSOR.ndvi_to_rgb(tile_data)
-        if rgb_image is None:
-            return {"tile_id": tile_job["id"], "status": "failed", "error": "RGB conversion failed"}
+def _tile_to_rgb(tile_data: np.ndarray):
+    """Colorize an NDVI tile for SAM.
 
-        segmentation_results = _GLOBAL_SAM_PROCESSOR.segment_forest_areas(rgb_image)
-        classification_results = _GLOBAL_SAM_PROCESSOR.classify_vegetation_health(
-            tile_data, segmentation_results
-        )
+    On CUDA only the float NDVI tile is uploaded and the colormap runs on the
+    GPU, so the RGB image is already on the device for the encoder.
+    """
+    if _GLOBAL_SAM_PROCESSOR.device == "cuda":
+        tile_tensor = torch.from_numpy(tile_data).to("cuda", non_blocking=True)
+        return _GLOBAL_SAM_PROCESSOR.ndvi_to_rgb_torch(tile_tensor)
+    return _GLOBAL_SAM_PROCESSOR.ndvi_to_rgb(tile_data)
 
-        # Save artifacts
-        tile_output_dir = Path(output_dir) / f"tile_{tile_job['id']:04d}"
-        tile_output_dir.mkdir(exist_ok=True, parents=True)
 
-        # Write NDVI tile
-        with rasterio.open(tile_output_dir / "ndvi_data.tif", "w", **tile_profile) as dst:
-            dst.write(tile_data)
+def _ndvi_compression(dtype) -> Dict:
+    """Creation options for NDVI output: ZSTD with the floating-point
+    predictor (horizontal differencing for integer data)"""
+    predictor = 3 if np.issubdtype(np.dtype(dtype), np.floating) else 2
+    return {"compress": "zstd", "zstd_level": 9, "predictor": predictor}
 
-        # Write masks as single-band uint8 rasters
-        for mask_name, mask_data in classification_results["masks"].items():
-            mask_profile = tile_profile.copy()
-            mask_profile.update({"dtype": "uint8", "count": 1})
-            with rasterio.open(tile_output_dir / f"{mask_name}_mask.tif", "w", **mask_profile) as dst:
-                dst.write(mask_data.astype(np.uint8), 1)
-
-        # Save statistics
-        stats_file = tile_output_dir / "statistics.json"
-        with open(stats_file, "w") as f:
-            json.dump(
-                {
-                    "tile_id": tile_job["id"],
-                    "bounds": tile_job["bounds"],
-                    "area_km2": tile_job["area_km2"],
-                    "statistics": classification_results["statistics"],
-                    "processing_status": "completed",
-                },
-                f,
-                indent=2,
-            )
 
-        return {
-            "tile_id": tile_job["id"],
-            "status": "completed",
-            "statistics": classification_results["statistics"],
-            "area_km2": tile_job["area_km2"],
-            "output_dir": str(tile_output_dir),
-        }
+def _mosaic_block_shape(profile: Dict) -> Tuple[int, int]:
+    """(rows, cols) of the output mosaics' blocks for an input profile.
+
+    The input's own blocks when it is tiled with sizes a tiled GeoTIFF can
+    use (multiples of 16), else MOSAIC_BLOCK_SIZE squares (e.g. for striped
+    inputs). Tile cores are snapped to this shape, so every window written
+    into a mosaic covers whole blocks.
+    """
+    if profile.get("tiled"):
+        rows, cols = profile["blockysize"], profile["blockxsize"]
+        if rows % 16 == 0 and cols % 16 == 0:
+            return rows, cols
+    return MOSAIC_BLOCK_SIZE, MOSAIC_BLOCK_SIZE
+
+
+def _stack_masks(masks) -> np.ndarray:
+    """Stack classification masks into one (len(MASK_NAMES), H, W) uint8 array"""
+    return np.stack([masks[mask_name].astype(np.uint8) for mask_name in MASK_NAMES])
+
+
+def _failed_result(tile_job: Dict, error: str) -> Dict:
+    return {"tile_id": tile_job.get("id"), "status": "failed", "error": error}
+
+
+def _skipped_result(tile: "TileInfo") -> Dict:
+    return {
+        "tile_id": tile.id,
+        "status": "skipped",
+        "reason": "no valid data",
+        "area_km2": tile.area_km2,
+        "bounds": tile.bounds,
+    }
+
+
+def _process_tile_batch_worker(job_list: List[Dict]) -> List[Dict]:
+    """Process a batch of tiles in a worker process or thread.
+
+    All tiles of the batch go through the SAM image encoder in one forward
+    pass; mask decoding, classification and output writing stay per tile.
+    The SAM processor, input GeoTIFF and base output directory come from
+    the worker globals set by ``_init_worker``, which must have run first.
+
+    Args:
+        job_list: Serializable dicts describing each tile window and metadata
+            (see ``_load_tile`` for the shared memory fields)
+
+    Returns:
+        One result dictionary per job, in the order of ``job_list``
+    """
+    results: Dict[int, Dict] = {}
+    loaded = []
+    shms: List[shared_memory.SharedMemory] = []
+    try:
+        with _inference_stream():
+            for tile_job in job_list:
+                try:
+                    tile_data, shm = _load_tile(tile_job)
+                    if shm is not None:
+                        shms.append(shm)
+                    rgb_image = _tile_to_rgb(tile_data)
+                    if rgb_image is None:
+                        results[tile_job["id"]] = _failed_result(tile_job, "RGB conversion failed")
+                        continue
+                    loaded.append((tile_job, tile_data, rgb_image))
+                except Exception as exc:  # pragma: no cover - defensive
+                    results[tile_job["id"]] = _failed_result(tile_job, str(exc))
+
+            sam_lock = _GLOBAL_SAM_LOCK if _GLOBAL_SAM_LOCK is not None else nullcontext()
+            try:
+                with sam_lock, _GLOBAL_SAM_PROCESSOR.inference_context():
+                    segmentations = _GLOBAL_SAM_PROCESSOR.segment_forest_areas_batch(
+                        [rgb_image for *_, rgb_image in loaded]
+                    )
+            except Exception as exc:  # pragma: no cover - defensive
+                for tile_job, *_ in loaded:
+                    results[tile_job["id"]] = _failed_result(tile_job, str(exc))
+                loaded, segmentations = [], []
+
+        for (tile_job, tile_data, _), segmentation_results in zip(loaded, segmentations):
+            try:
+                core = _core_slices(Window(*tile_job["window"]), Window(*tile_job["core_window"]))
+                classification_results = _GLOBAL_SAM_PROCESSOR.classify_vegetation_health(
+                    tile_data, segmentation_results, core=core
+                )
+                results[tile_job["id"]] = _save_tile_outputs(
+                    tile_job, tile_data, classification_results
+                )
+            except Exception as exc:  # pragma: no cover - defensive
+                results[tile_job["id"]] = _failed_result(tile_job, str(exc))
 
     except Exception as exc:  # pragma: no cover - defensive
-        return {
-            "tile_id": tile_job.get("id"),
-            "status": "failed",
-            "error": str(exc),
-        }
+        for tile_job in job_list:
+            results.setdefault(tile_job["id"], _failed_result(tile_job, str(exc)))
+
+    finally:
+        # Drop the views before closing our mappings; the parent unlinks the blocks
+        loaded = tile_data = None
+        for shm in shms:
+            shm.close()
+
+    return [results[tile_job["id"]] for tile_job in job_list]
+
 
 @dataclass
 class TileInfo:
@@ -133,7 +434,23 @@ class TileInfo:
     window: Window
     bounds: Tuple[float, float, float, float]
     area_km2: float
-    priority: int = 1  # 1=high, 2=medium, 3=low
+    priority: int = 1  # 1=high, 2=medium, 3=low, NODATA_PRIORITY=skipped
+    core_window: Optional[Window] = None  # window without the overlap margin
+
+    @property
+    def core_slices(self) -> Tuple[slice, slice]:
+        """(row, col) slices of the core window within the tile's array"""
+        return _core_slices(self.window, self.core_window or self.window)
+
+
+def _core_slices(window: Window, core_window: Window) -> Tuple[slice, slice]:
+    """(row, col) slices locating core_window inside an array read for window"""
+    row0 = int(core_window.row_off) - int(window.row_off)
+    col0 = int(core_window.col_off) - int(window.col_off)
+    return (
+        slice(row0, row0 + int(core_window.height)),
+        slice(col0, col0 + int(core_window.width)),
+    )
 
 class ScalableForestProcessor:
     """
@@ -172,12 +489,18 @@ class ScalableForestProcessor:
         
         Args:
             input_path: Path to large GeoTIFF
-            fire_boundary: Optional fire boundary for priority weighting
+            fire_boundary: Optional fire boundary for priority weighting, a
+                GeoJSON geometry (or Feature) in the raster's CRS
             
         Returns:
             List of TileInfo objects with processing strategy
         """
         with rasterio.open(input_path) as src:
+            valid_mask = self._coarse_valid_mask(src)
+            burn_mask = (
+                self._coarse_burn_mask(src, fire_boundary, valid_mask) if fire_boundary else None
+            )
+            
             total_pixels = src.width * src.height
             pixel_size_bytes = 4  # float32
             total_size_mb = (total_pixels * pixel_size_bytes) / (1024**2)
@@ -188,85 +511,196 @@ class ScalableForestProcessor:
             pixels_per_tile = (self.tile_size_mb * 1024**2) // pixel_size_bytes
             tile_dimension = int(math.sqrt(pixels_per_tile))
             
-            # Adjust for actual raster dimensions
-            tiles_x = math.ceil(src.width / tile_dimension)
-            tiles_y = math.ceil(src.height / tile_dimension)
+            # Snap tiles to whole output-mosaic blocks (at least one), so each
+            # r+ window write re-encodes only that tile's blocks. For tiled
+            # inputs these are the input's blocks, so no read decodes a block
+            # only to discard part of it either.
+            block_height, block_width = _mosaic_block_shape(src.profile)
+            tile_width = max(1, tile_dimension // block_width) * block_width
+            tile_height = max(1, tile_dimension // block_height) * block_height
             
-            actual_tile_width = src.width / tiles_x
-            actual_tile_height = src.height / tiles_y
+            # Adjust for actual raster dimensions
+            tiles_x = math.ceil(src.width / tile_width)
+            tiles_y = math.ceil(src.height / tile_height)
             
             self.logger.info(f"Tiling strategy: {tiles_x}x{tiles_y} tiles "
-                           f"({actual_tile_width:.0f}x{actual_tile_height:.0f} pixels each)")
+                           f"({tile_width}x{tile_height} pixels each, "
+                           f"{block_width}x{block_height} blocks)")
             
             tiles = []
+            core_bounds = []
             tile_id = 0
             
             for row in range(tiles_y):
                 for col in range(tiles_x):
-                    # Calculate window with overlap
-                    col_off = max(0, int(col * actual_tile_width) - self.overlap_pixels)
-                    row_off = max(0, int(row * actual_tile_height) - self.overlap_pixels)
+                    # Core windows partition the raster exactly; each tile's
+                    # statistics and written pixels come from its core only
+                    core_col_off = col * tile_width
+                    core_row_off = row * tile_height
+                    core_col_end = min(core_col_off + tile_width, src.width)
+                    core_row_end = min(core_row_off + tile_height, src.height)
+                    core_window = Window(
+                        core_col_off,
+                        core_row_off,
+                        core_col_end - core_col_off,
+                        core_row_end - core_row_off,
+                    )
+                    
+                    # Calculate window with overlap around the core. The margin is
+                    # not widened to whole blocks: that would only grow the SAM
+                    # input, since each block is decoded once either way.
+                    col_off = max(0, core_col_off - self.overlap_pixels)
+                    row_off = max(0, core_row_off - self.overlap_pixels)
                     
-                    width = min(int(actual_tile_width) + 2 * self.overlap_pixels, 
-                              src.width - col_off)
-                    height = min(int(actual_tile_height) + 2 * self.overlap_pixels, 
-                               src.height - row_off)
+                    width = min(core_col_end + self.overlap_pixels, src.width) - col_off
+                    height = min(core_row_end + self.overlap_pixels, src.height) - row_off
                     
                     window = Window(col_off, row_off, width, height)
                     
                     # Calculate geographic bounds
                     window_bounds = rasterio.windows.bounds(window, src.transform)
                     
-                    # Calculate area
-                    area_km2 = self._calculate_area_km2(window_bounds, src.crs)
+                    # Area is measured on the core only, so tile areas sum to the raster's
+                    core_bounds.append(rasterio.windows.bounds(core_window, src.transform))
                     
                     # Determine priority (higher priority for fire center areas)
-                    priority = self._calculate_priority(window_bounds, fire_boundary)
+                    priority = self._calculate_priority(window, burn_mask, valid_mask)
                     
                     tiles.append(TileInfo(
                         id=tile_id,
                         window=window,
                         bounds=window_bounds,
-                        area_km2=area_km2,
-                        priority=priority
+                        area_km2=0.0,  # filled in below for all tiles at once
+                        priority=priority,
+                        core_window=core_window
                     ))
                     
                     tile_id += 1
             
-            # Sort by priority (high priority first)
-            tiles.sort(key=lambda t: t.priority)
+            for tile, area_km2 in zip(tiles, self._calculate_areas_km2(core_bounds, src.crs)):
+                tile.area_km2 = float(area_km2)
+            
+            # Sort by priority (high priority first), and within a priority along
+            # a Hilbert curve over the tile grid so consecutively dispatched
+            # tiles are spatial neighbours (shared blocks, warm page cache)
+            # (tile ids are assigned row-major above)
+            grid_order = max(tiles_x, tiles_y)
+            tiles.sort(key=lambda t: (
+                t.priority,
+                _hilbert_index(grid_order, t.id % tiles_x, t.id // tiles_x),
+            ))
             
             self.logger.info(f"Generated {len(tiles)} tiles for processing")
             return tiles
     
-    def _calculate_area_km2(self, bounds: Tuple, crs) -> float:
-        """Calculate area of bounds in km²"""
-        from pyproj import CRS, Transformer
+    def _calculate_areas_km2(self, bounds: List[Tuple], crs) -> np.ndarray:
+        """Calculate the area in km² of each (left, bottom, right, top) bounds"""
+        bounds_arr = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
         
         # Convert to appropriate projected CRS for area calculation
         if crs.is_geographic:
-            # Use UTM zone for Colorado (approximately Zone 13N)
-            utm_crs = CRS.from_epsg(32613)  # UTM Zone 13N
-            transformer = Transformer.from_crs(crs, utm_crs, always_xy=True)
-            
-            x1, y1 = transformer.transform(bounds[0], bounds[1])
-            x2, y2 = transformer.transform(bounds[2], bounds[3])
-            
-            area_m2 = abs(x2 - x1) * abs(y2 - y1)
-            return area_m2 / 1000000  # Convert to km²
+            # One vectorized transform call per corner for all tiles
+            transformer = _get_utm_transformer(crs.to_wkt())
+            x1, y1 = transformer.transform(bounds_arr[:, 0], bounds_arr[:, 1])
+            x2, y2 = transformer.transform(bounds_arr[:, 2], bounds_arr[:, 3])
         else:
             # Already projected
-            area_m2 = abs(bounds[2] - bounds[0]) * abs(bounds[3] - bounds[1])
-            return area_m2 / 1000000
+            x1, y1, x2, y2 = bounds_arr.T
+        
+        area_m2 = np.abs(x2 - x1) * np.abs(y2 - y1)
+        return area_m2 / 1000000  # Convert to km²
+    
+    def _coarse_valid_mask(self, src) -> np.ndarray:
+        """
+        Find valid data on a decimated grid
+        
+        A coarse cell is valid if any pixel under it is finite and not nodata,
+        so scattered NaNs (e.g. from division by zero over water) don't hide
+        a tile's data. The first band is scanned once, in strips of whole cell
+        rows, so priority scoring and nodata skipping cost no per-tile I/O.
+        (A decimated GDAL read can't be used: averaging propagates NaNs.)
+        
+        Args:
+            src: Open input dataset
+            
+        Returns:
+            Boolean (rows, cols) mask of coarse cells with finite, non-nodata values
+        """
+        cell = PRIORITY_DECIMATION
+        rows = max(1, math.ceil(src.height / cell))
+        cols = max(1, math.ceil(src.width / cell))
+        valid = np.zeros((rows, cols), dtype=bool)
+        
+        # Strips span whole block rows where they can, so no block is decoded twice
+        block_height = src.block_shapes[0][0]
+        step = block_height if block_height % cell == 0 else cell
+        row_bytes = src.width * np.dtype(src.dtypes[0]).itemsize
+        step *= max(1, VALID_MASK_READ_BYTES // (row_bytes * step))
+        
+        for row_off in range(0, src.height, step):
+            strip = src.read(
+                1, window=Window(0, row_off, src.width, min(step, src.height - row_off)),
+                masked=True,
+            )
+            strip_valid = ~np.ma.getmaskarray(strip) & np.isfinite(strip.data)
+            
+            # Pad to whole cells, then reduce each cell with any()
+            cell_rows = math.ceil(strip_valid.shape[0] / cell)
+            padded = np.zeros((cell_rows * cell, cols * cell), dtype=bool)
+            padded[:strip_valid.shape[0], :src.width] = strip_valid
+            first = row_off // cell
+            valid[first:first + cell_rows] = padded.reshape(
+                cell_rows, cell, cols, cell
+            ).any(axis=(1, 3))
+        return valid
     
-    def _calculate_priority(self, bounds: Tuple, fire_boundary: Dict = None) -> int:
-        """Calculate processing priority for tile (1=high, 3=low)"""
-        if fire_boundary is None:
+    def _coarse_burn_mask(self, src, fire_boundary: Dict, valid_mask: np.ndarray) -> np.ndarray:
+        """
+        Rasterize the fire boundary over valid data on the decimated grid
+        
+        Args:
+            src: Open input dataset
+            fire_boundary: GeoJSON geometry (or Feature) in the raster's CRS
+            valid_mask: Coarse valid-data mask from _coarse_valid_mask
+            
+        Returns:
+            Boolean (rows, cols) mask of coarse cells with data inside the fire
+        """
+        coarse_transform = src.transform * Affine.scale(
+            src.width / valid_mask.shape[1], src.height / valid_mask.shape[0]
+        )
+        
+        geometry = fire_boundary.get("geometry", fire_boundary)
+        inside = geometry_mask([geometry], valid_mask.shape, coarse_transform, invert=True)
+        return inside & valid_mask
+    
+    def _calculate_priority(self,
+                            window: Window,
+                            burn_mask: Optional[np.ndarray] = None,
+                            valid_mask: Optional[np.ndarray] = None) -> int:
+        """Calculate processing priority for tile (1=high, 3=low, NODATA_PRIORITY=skip)"""
+        # Coarse cells covered by the tile
+        rows = slice(int(window.row_off) // PRIORITY_DECIMATION,
+                     math.ceil((window.row_off + window.height) / PRIORITY_DECIMATION))
+        cols = slice(int(window.col_off) // PRIORITY_DECIMATION,
+                     math.ceil((window.col_off + window.width) / PRIORITY_DECIMATION))
+        
+        if valid_mask is not None:
+            valid_cells = valid_mask[rows, cols]
+            if not valid_cells.size or valid_cells.mean() < MIN_VALID_FRACTION:
+                return NODATA_PRIORITY
+        
+        if burn_mask is None:
             return 2  # Medium priority
         
-        # TODO: Implement geometric intersection with fire boundary
-        # For now, return medium priority
-        return 2
+        # Share of the tile's coarse cells that fall inside the fire
+        burned_fraction = burn_mask[rows, cols].mean() if burn_mask[rows, cols].size else 0.0
+        
+        if burned_fraction >= 0.5:
+            return 1
+        if burned_fraction > 0:
+            return 2
+        return 3
     
     def process_tile(self, 
                      input_path: Path,
@@ -283,6 +717,9 @@ class ScalableForestProcessor:
         Returns:
             Dictionary with processing results
         """
+        if tile.priority == NODATA_PRIORITY:
+            return _skipped_result(tile)
+        
         try:
             # Initialize SAM processor if needed
             if self.sam_processor is None:
@@ -292,14 +729,20 @@ class ScalableForestProcessor:
             # Read tile data
             with rasterio.open(input_path) as src:
                 tile_data = src.read(window=tile.window)
-                tile_transform = rasterio.windows.transform(tile.window, src.transform)
                 
-                # Prepare tile metadata
+                # Prepare tile metadata (outputs cover the core window only)
+                core_window = tile.core_window or tile.window
                 tile_profile = src.profile.copy()
                 tile_profile.update({
-                    'height': tile.window.height,
-                    'width': tile.window.width,
-                    'transform': tile_transform
+                    'height': core_window.height,
+                    'width': core_window.width,
+                    'transform': rasterio.windows.transform(core_window, src.transform),
+                    'driver': 'GTiff',
+                    'tiled': True,
+                    'blockxsize': MOSAIC_BLOCK_SIZE,
+                    'blockysize': MOSAIC_BLOCK_SIZE,
+                    'BIGTIFF': 'IF_SAFER',
+                    **_ndvi_compression(src.dtypes[0]),
                 })
             
             # Convert to RGB for SAM
@@ -308,11 +751,13 @@ class ScalableForestProcessor:
                 return {'tile_id': tile.id, 'status': 'failed', 'error': 'RGB conversion failed'}
             
             # Run SAM segmentation
-            segmentation_results = self.sam_processor.segment_forest_areas(rgb_image)
+            with self.sam_processor.inference_context():
+                segmentation_results = self.sam_processor.segment_forest_areas(rgb_image)
             
             # Classify vegetation health
+            core_rows, core_cols = tile.core_slices
             classification_results = self.sam_processor.classify_vegetation_health(
-                tile_data, segmentation_results
+                tile_data, segmentation_results, core=(core_rows, core_cols)
             )
             
             # Save tile results
@@ -321,26 +766,28 @@ class ScalableForestProcessor:
             
             # Save processed data
             with rasterio.open(tile_output_dir / "ndvi_data.tif", 'w', **tile_profile) as dst:
-                dst.write(tile_data)
+                dst.write(tile_data[:, core_rows, core_cols])
             
-            # Save classification masks
-            for mask_name, mask_data in classification_results['masks'].items():
-                mask_profile = tile_profile.copy()
-                mask_profile.update({'dtype': 'uint8'})
-                
-                with rasterio.open(tile_output_dir / f"{mask_name}_mask.tif", 'w', **mask_profile) as dst:
-                    dst.write(mask_data.astype(np.uint8), 1)
+            # Save classification masks, one band per class
+            mask_profile = tile_profile.copy()
+            mask_profile.update({
+                'dtype': 'uint8',
+                'count': len(MASK_NAMES),
+                **_ndvi_compression('uint8'),
+            })
+            with rasterio.open(tile_output_dir / MASKS_MOSAIC_NAME, 'w', **mask_profile) as dst:
+                dst.write(_stack_masks(classification_results['masks']))
+                dst.descriptions = MASK_NAMES
             
             # Save statistics
             stats_file = tile_output_dir / "statistics.json"
-            with open(stats_file, 'w') as f:
-                json.dump({
-                    'tile_id': tile.id,
-                    'bounds': tile.bounds,
-                    'area_km2': tile.area_km2,
-                    'statistics': classification_results['statistics'],
-                    'processing_status': 'completed'
-                }, f, indent=2)
+            stats_file.write_bytes(_dumps({
+                'tile_id': tile.id,
+                'bounds': tile.bounds,
+                'area_km2': tile.area_km2,
+                'statistics': classification_results['statistics'],
+                'processing_status': 'completed'
+            }, indent=True))
             
             return {
                 'tile_id': tile.id,
@@ -362,15 +809,21 @@ class ScalableForestProcessor:
                           input_path: Path,
                           output_dir: Path,
                           fire_boundary: Dict = None,
-                          max_workers: int = None) -> Dict:
+                          max_workers: int = None,
+                          batch_size: int = None) -> Dict:
         """
         Process entire large area using tiling strategy
         
+        On CPU, batch_size and then max_workers are lowered until the
+        workers' estimated peak memory fits in max_memory_gb.
+        
         Args:
             input_path: Path to large GeoTIFF
             output_dir: Output directory for results
             fire_boundary: Optional fire boundary for priority
             max_workers: Number of parallel workers (auto-detect if None)
+            batch_size: Tiles per worker task; each batch shares one SAM
+                image-encoder forward pass (default: 4 on CUDA, 1 on CPU)
             
         Returns:
             Dictionary with aggregated results
@@ -384,114 +837,340 @@ class ScalableForestProcessor:
         if max_workers is None:
             max_workers = min(4, max(1, psutil.cpu_count() // 2))
         
-        self.logger.info(f"Processing {len(tiles)} tiles with {max_workers} workers")
-        
-        # Build serializable jobs
-        jobs: List[Dict] = []
-        for tile in tiles:
-            jobs.append(
-                {
-                    "id": tile.id,
-                    "window": (
-                        int(tile.window.col_off),
-                        int(tile.window.row_off),
-                        int(tile.window.width),
-                        int(tile.window.height),
-                    ),
-                    "bounds": tile.bounds,
-                    "area_km2": tile.area_km2,
-                }
-            )
-
-        # Process tiles in parallel using per-process SAM instances
-        results: List[Dict] = []
+        cuda = torch.cuda.is_available()
+        if batch_size is None:
+            # Batching pays off on a GPU; on CPU each batched image only adds
+            # its encoder activations to the worker's peak memory
+            batch_size = 4 if cuda else 1
+        if not cuda:
+            max_workers, batch_size = self._fit_workers_to_memory(max_workers, batch_size)
+        
+        # Tiles without valid data never reach SAM (their mosaic windows stay empty)
+        active_tiles = [tile for tile in tiles if tile.priority != NODATA_PRIORITY]
+        skipped_tiles = len(tiles) - len(active_tiles)
+        
+        self.logger.info(f"Processing {len(active_tiles)} tiles with {max_workers} workers "
+                         f"({skipped_tiles} without valid data skipped)")
+        
+        # Tiles are decoded batch by batch, just before dispatch. For worker
+        # processes each goes straight into its own shared memory block, which
+        # they attach to by name (zero-copy); threads get the array itself.
+        # Only a bounded number of batches is ever in flight.
+        shm_blocks: Dict[int, shared_memory.SharedMemory] = {}
         completed_tiles = 0
         failed_tiles = 0
+        reported_ids = set()
+        stop_reason = None
+        total_area = 0.0
+        totals = np.zeros(len(_AGGREGATE_KEYS), dtype=np.int64)
+        batch_lengths = [len(chunk) for chunk in _chunked(active_tiles, batch_size)]
+        try:
+            with rasterio.open(input_path) as src, \
+                    TileReader(input_path, src=src) as reader, \
+                    open(output_dir / ALL_TILE_STATS_NAME, "wb") as stats_file:
+                self._create_output_mosaics(reader.profile, output_dir)
+                for tile in tiles:
+                    if tile.priority == NODATA_PRIORITY:
+                        stats_file.write(_dumps(_skipped_result(tile)) + b"\n")
+                if not active_tiles:
+                    # Nothing to segment: don't start workers or load SAM
+                    return self._write_summary(output_dir, tiles, 0, 0, 0.0, totals)
 
-        with ProcessPoolExecutor(
-            max_workers=max_workers,
-            initializer=_init_worker,
-            initargs=("vit_b",),
-        ) as executor:
-            futures = [
-                executor.submit(
-                    _process_tile_worker,
-                    str(input_path),
-                    str(output_dir),
-                    job,
+                # Missing weights fail here, once, instead of in every worker's
+                # initializer (and concurrent workers never race a download)
+                checkpoint_path = str(
+                    ForestSAMProcessor(model_type="vit_b", device="cpu")
+                    .resolve_checkpoint()
+                    .resolve()
                 )
-                for job in jobs
-            ]
-
-            with tqdm(total=len(futures), desc="Processing tiles") as pbar:
-                for future in as_completed(futures):
-                    try:
-                        result = future.result(timeout=300)
-                        results.append(result)
-                        if result.get("status") == "completed":
-                            completed_tiles += 1
+
+                def load_batch(chunk: List[TileInfo]) -> List[Dict]:
+                    jobs = []
+                    for tile in chunk:
+                        if cuda:
+                            # Threads of this process take the array as is
+                            tile_pixels = {"data": reader.read(tile.window)}
                         else:
-                            failed_tiles += 1
-                    except Exception as e:  # pragma: no cover - defensive
-                        self.logger.error(f"Tile processing failed: {e}")
+                            shape = (
+                                reader.count, int(tile.window.height), int(tile.window.width)
+                            )
+                            shm = shared_memory.SharedMemory(
+                                create=True, size=int(np.prod(shape)) * reader.dtype.itemsize
+                            )
+                            shm_blocks[tile.id] = shm
+                            reader.read(
+                                tile.window,
+                                out=np.ndarray(shape, dtype=reader.dtype, buffer=shm.buf),
+                            )
+                            tile_pixels = {
+                                "shm": shm.name, "shape": shape, "dtype": reader.dtype.str
+                            }
+                        jobs.append(
+                            {
+                                "id": tile.id,
+                                "window": (
+                                    int(tile.window.col_off),
+                                    int(tile.window.row_off),
+                                    int(tile.window.width),
+                                    int(tile.window.height),
+                                ),
+                                "core_window": (
+                                    int(tile.core_window.col_off),
+                                    int(tile.core_window.row_off),
+                                    int(tile.core_window.width),
+                                    int(tile.core_window.height),
+                                ),
+                                "bounds": tile.bounds,
+                                "area_km2": tile.area_km2,
+                                **tile_pixels,
+                            }
+                        )
+                    return jobs
+
+                finished = False
+                with ExitStack() as stack:
+                    if cuda:
+                        # Worker processes would serialize on the one GPU anyway, each
+                        # paying for its own CUDA context and model copy. Use one model
+                        # in this process and max_workers threads, so batches' CPU-side
+                        # work overlaps another batch's GPU inference. Runs after the
+                        # threads have stopped (ExitStack is LIFO).
+                        self.logger.info(
+                            f"CUDA available: processing tiles with {max_workers} threads"
+                        )
+                        stack.callback(_reset_worker_globals)
+                        _init_worker(
+                            "vit_b", str(input_path), str(output_dir),
+                            threading.Lock(), threading.Lock(), checkpoint_path,
+                        )
+                        # Weights are on the device before side streams use them
+                        torch.cuda.synchronize()
+                        executor = stack.enter_context(ThreadPoolExecutor(max_workers))
+                    else:
+                        # Process tiles in parallel using per-process SAM instances.
+                        # Removed after the pool has shut down (ExitStack is LIFO).
+                        with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as init_file:
+                            pickle.dump(
+                                {
+                                    "model_type": "vit_b",
+                                    "input_path": str(input_path),
+                                    "output_dir": str(output_dir),
+                                    "checkpoint_path": checkpoint_path,
+                                },
+                                init_file,
+                            )
+                        stack.callback(os.unlink, init_file.name)
+                        # A worker that dies (failed initializer, OOM kill) breaks
+                        # the executor, which fails every pending batch at once
+                        executor = stack.enter_context(ProcessPoolExecutor(
+                            max_workers,
+                            mp_context=_MP_CONTEXT,
+                            initializer=_init_worker_from_file,
+                            initargs=(init_file.name, _MP_CONTEXT.Lock()),
+                        ))
+                        # After an early stop, don't wait for a stalled worker
+                        stack.callback(lambda: finished or _terminate_workers(executor))
+
+                    # Batches are loaded only when there is room for them: each
+                    # worker busy with one batch and one queued behind it
+                    max_pending = 2 * max_workers
+                    chunks = _chunked(active_tiles, batch_size)
+                    pending = set()
+                    # On an early exit, queued batches never start (LIFO: runs
+                    # before the executor shuts down)
+                    stack.callback(lambda: [future.cancel() for future in pending])
+
+                    def next_batch(timeout: float) -> List[Dict]:
+                        for chunk in itertools.islice(chunks, max_pending - len(pending)):
+                            pending.add(
+                                executor.submit(_process_tile_batch_worker, load_batch(chunk))
+                            )
+                        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                        if not done:
+                            raise TimeoutError(f"no tile batch finished within {timeout:.0f} s")
+                        future = done.pop()
+                        pending.remove(future)
+                        return future.result()
+
+                    with tqdm(total=len(active_tiles), desc="Processing tiles") as pbar:
+                        for batch_length in batch_lengths:
+                            try:
+                                # Completion order is arbitrary; the length only sizes the wait
+                                batch_results = next_batch(timeout=300 * batch_length)
+                            except Exception as e:
+                                # A broken pool fails every batch, and which batch stalled
+                                # is unknown (results arrive in any order), so stop here:
+                                # dispatch ends, the workers are torn down and every tile
+                                # without a result is reported as failed below
+                                stop_reason = f"{type(e).__name__}: {e}"
+                                self.logger.error(
+                                    f"Tile batch processing failed, stopping: {stop_reason}"
+                                )
+                                break
+
+                            # Fold each result into the running totals instead of keeping it
+                            for result in batch_results:
+                                reported_ids.add(result.get("tile_id"))
+                                _release_shared_block(shm_blocks.pop(result.get("tile_id"), None))
+                                stats_file.write(_dumps(result) + b"\n")
+                                if result.get("status") == "completed":
+                                    completed_tiles += 1
+                                    total_area += result.get("area_km2", 0)
+                                    stats = result.get("statistics", {})
+                                    totals += np.fromiter(
+                                        (stats.get(key, 0) for key in _AGGREGATE_KEYS),
+                                        dtype=np.int64,
+                                        count=len(_AGGREGATE_KEYS),
+                                    )
+                                else:
+                                    failed_tiles += 1
+                            pbar.update(len(batch_results))
+                            pbar.set_postfix({"Completed": completed_tiles, "Failed": failed_tiles})
+                        else:
+                            finished = True
+
+                for tile in active_tiles:
+                    if tile.id not in reported_ids:
+                        result = _failed_result(
+                            {"id": tile.id}, f"processing stopped ({stop_reason})"
+                        )
+                        stats_file.write(_dumps(result) + b"\n")
                         failed_tiles += 1
-                    finally:
-                        pbar.update(1)
-                        pbar.set_postfix({"Completed": completed_tiles, "Failed": failed_tiles})
+        finally:
+            for shm in list(shm_blocks.values()):
+                _release_shared_block(shm)
         
-        # Aggregate results
-        total_area = sum(r.get('area_km2', 0) for r in results if r['status'] == 'completed')
+        return self._write_summary(
+            output_dir, tiles, completed_tiles, failed_tiles, total_area, totals
+        )
+    
+    def _fit_workers_to_memory(self, max_workers: int, batch_size: int) -> Tuple[int, int]:
+        """
+        Lower batch size, then worker count, until CPU workers fit in max_memory_gb
         
-        # Combine statistics from all tiles
-        aggregated_stats = self._aggregate_tile_statistics(results)
+        Args:
+            max_workers: Requested number of worker processes
+            batch_size: Requested tiles per worker task
+            
+        Returns:
+            Tuple of (max_workers, batch_size), each at least 1
+        """
+        # Parallel workers gain more on CPU than batching, so the batch gives way first
+        worker_budget_gb = self.max_memory_gb / max_workers
+        fit_batch = int((worker_budget_gb - WORKER_BASE_MEMORY_GB) // WORKER_IMAGE_MEMORY_GB)
+        fit_batch = max(1, min(batch_size, fit_batch))
+        worker_memory_gb = WORKER_BASE_MEMORY_GB + fit_batch * WORKER_IMAGE_MEMORY_GB
+        fit_workers = max(1, min(max_workers, int(self.max_memory_gb // worker_memory_gb)))
+        
+        if (fit_workers, fit_batch) != (max_workers, batch_size):
+            self.logger.warning(
+                f"Using {fit_workers} workers x batch size {fit_batch} instead of "
+                f"{max_workers} x {batch_size}: each CPU worker needs about "
+                f"{worker_memory_gb:.1f} GB, max_memory_gb is {self.max_memory_gb:.1f}"
+            )
+        return fit_workers, fit_batch
+    
+    def _write_summary(self,
+                       output_dir: Path,
+                       tiles: List[TileInfo],
+                       completed_tiles: int,
+                       failed_tiles: int,
+                       total_area: float,
+                       totals: np.ndarray) -> Dict:
+        """
+        Save and return the run summary; per-tile results are in ALL_TILE_STATS_NAME
         
-        # Save aggregated results
+        Args:
+            output_dir: Output directory for results
+            tiles: All tiles of the run, including skipped ones
+            completed_tiles: Number of tiles processed successfully
+            failed_tiles: Number of tiles that failed
+            total_area: Area in km² of the completed tiles
+            totals: Pixel counts summed over completed tiles, in _AGGREGATE_KEYS order
+            
+        Returns:
+            Dictionary with aggregated results
+        """
+        active_count = sum(tile.priority != NODATA_PRIORITY for tile in tiles)
         summary = {
             'processing_summary': {
                 'total_tiles': len(tiles),
                 'completed_tiles': completed_tiles,
                 'failed_tiles': failed_tiles,
-                'success_rate': completed_tiles / len(tiles) * 100,
+                'skipped_tiles': len(tiles) - active_count,
+                'success_rate': completed_tiles / max(1, active_count) * 100,
                 'total_area_km2': total_area
             },
-            'aggregated_statistics': aggregated_stats,
-            'tile_results': results
+            'aggregated_statistics': self._aggregate_tile_statistics(totals),
         }
         
-        with open(output_dir / "processing_summary.json", 'w') as f:
-            json.dump(summary, f, indent=2)
+        (output_dir / "processing_summary.json").write_bytes(_dumps(summary, indent=True))
         
-        self.logger.info(f"Processing complete: {completed_tiles}/{len(tiles)} tiles successful")
+        self.logger.info(f"Processing complete: {completed_tiles}/{active_count} tiles successful")
         
         return summary
     
-    def _aggregate_tile_statistics(self, results: List[Dict]) -> Dict:
-        """Aggregate statistics from all processed tiles"""
-        total_pixels = {'healthy': 0, 'stressed': 0, 'declining': 0, 'dead': 0}
-        total_vegetation_pixels = 0
-        
-        for result in results:
-            if result['status'] == 'completed' and 'statistics' in result:
-                stats = result['statistics']
-                total_pixels['healthy'] += stats.get('healthy_pixels', 0)
-                total_pixels['stressed'] += stats.get('stressed_pixels', 0)
-                total_pixels['declining'] += stats.get('declining_pixels', 0)
-                total_pixels['dead'] += stats.get('dead_pixels', 0)
-                total_vegetation_pixels += stats.get('total_vegetation_pixels', 0)
+    def _create_output_mosaics(self, profile: Dict, output_dir: Path) -> None:
+        """
+        Pre-create the full-extent NDVI and multiband mask rasters that workers fill
+        
+        They are tiled BigTIFFs (NDVI: ZSTD with a predictor, masks: LZW) with
+        the block shape tile cores are snapped to (see _mosaic_block_shape).
+        Creation is sparse, so no pixel data is written until a worker writes
+        its window.
+        
+        Args:
+            profile: Profile of the input raster
+            output_dir: Output directory for results
+        """
+        block_height, block_width = _mosaic_block_shape(profile)
+        mosaic_profile = profile.copy()
+        mosaic_profile.update(
+            driver="GTiff",
+            tiled=True,
+            blockxsize=block_width,
+            blockysize=block_height,
+            BIGTIFF="YES",
+            SPARSE_OK=True,
+            **_ndvi_compression(profile["dtype"]),
+        )
+        with rasterio.open(output_dir / NDVI_MOSAIC_NAME, "w", **mosaic_profile):
+            pass
+        
+        mosaic_profile.pop("zstd_level")
+        mosaic_profile.update(
+            dtype="uint8",
+            count=len(MASK_NAMES),
+            nodata=None,
+            interleave="band",
+            compress="lzw",
+            predictor=1,
+        )
+        with rasterio.open(output_dir / MASKS_MOSAIC_NAME, "w", **mosaic_profile) as dst:
+            dst.descriptions = MASK_NAMES
+    
+    def _aggregate_tile_statistics(self, totals: np.ndarray) -> Dict:
+        """
+        Turn summed per-tile counts into aggregate statistics
+        
+        Args:
+            totals: Pixel counts summed over completed tiles, in _AGGREGATE_KEYS order
+        """
+        class_pixels = totals[:-1]
+        total_vegetation_pixels = int(totals[-1])
         
         # Calculate percentages
         if total_vegetation_pixels > 0:
-            percentages = {
-                f'{category}_percent': (pixels / total_vegetation_pixels * 100)
-                for category, pixels in total_pixels.items()
-            }
+            percentages = class_pixels / total_vegetation_pixels * 100
         else:
-            percentages = {f'{category}_percent': 0 for category in total_pixels.keys()}
+            percentages = np.zeros(len(class_pixels), dtype=int)
         
         return {
-            **{f'{category}_pixels': pixels for category, pixels in total_pixels.items()},
+            **{f'{category}_pixels': int(pixels)
+               for category, pixels in zip(_AGGREGATE_CLASSES, class_pixels)},
             'total_vegetation_pixels': total_vegetation_pixels,
-            **percentages
+            **{f'{category}_percent': pct.item()
+               for category, pct in zip(_AGGREGATE_CLASSES, percentages)}
         }
 
 def main():
@@ -2,23 +2,37 @@
 Scale Solutions Demo - Shows how to address scale limitations
 Demonstrates both local tiling and cloud processing approaches without requiring GEE
 """
+import functools
+import io
+import os
+import string
 import numpy as np
 from pathlib import Path
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional, Sequence, TextIO, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, is_dataclass
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(frozen=True)
 class ProcessingStrategy:
     """Information about a processing strategy"""
+    # Explicit rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('name', 'area_km2', 'approach', 'estimated_time_hours', 'memory_gb',
+                 'output_size_gb', 'feasibility', 'pros', 'cons')
+    
     name: str
     area_km2: float
     approach: str
@@ -26,8 +40,274 @@ class ProcessingStrategy:
     memory_gb: int
     output_size_gb: float
     feasibility: str
-    pros: List[str]
-    cons: List[str]
+    pros: Tuple[str, ...]
+    cons: Tuple[str, ...]
+
+# Major Colorado fires and their burned areas in km²
+FIRE_AREAS_KM2 = {
+    'East Troublesome Fire (2020)': 784.21,
+    'Cameron Peak Fire (2020)': 835.08,
+    'Pine Gulch Fire (2020)': 551.45,
+    'Hayman Fire (2002)': 555.16,
+    'Black Forest Fire (2013)': 60.04,
+    'Marshall Fire (2021)': 24.30
+}
+
+# Base metrics from the current system, and tiling/timing constants derived from them
+BASE_PIXELS = 10_859_685
+BASE_TIME_SECONDS = 8
+MODEL_LOAD_SECONDS = 5  # SAM model loading overhead
+TILE_SIZE_MB = 50
+_PIXELS_PER_TILE = (TILE_SIZE_MB * BASE_PIXELS) // 44  # 44 MB current file size
+_PROCESSING_TIME_PER_PIXEL = (BASE_TIME_SECONDS - MODEL_LOAD_SECONDS) / BASE_PIXELS
+
+# Static parts of the limitations and strategy analyses
+_BOTTLENECKS = (
+    'SAM model requires 375MB GPU/CPU memory per instance',
+    'Single tile processing - no parallelization',
+    'All data loaded into memory simultaneously',
+    'No cloud-based processing pipeline',
+    'Limited to pre-processed tile sizes'
+)
+_HYBRID_APPROACH = MappingProxyType({
+    'description': "Use tiling for local development, cloud for production",
+    'benefits': (
+        "Develop and test locally with tiling",
+        "Scale to production with cloud processing",
+        "Fallback option if cloud unavailable",
+        "Cost-effective for different use cases"
+    )
+})
+
+# Feasibility assessments, shared by every metrics result
+_FEASIBLE = MappingProxyType({
+    'status': '✅ Feasible',
+    'approach': 'Single tile processing',
+    'confidence': 'High'
+})
+_HIGHLY_FEASIBLE = MappingProxyType({
+    'status': '✅ Highly Feasible',
+    'approach': 'Tiled processing with parallelization',
+    'confidence': 'High'
+})
+_COMPLEX_BUT_FEASIBLE = MappingProxyType({
+    'status': '⚠️ Complex but Feasible',
+    'approach': 'Large-scale tiling or cloud processing recommended',
+    'confidence': 'Medium'
+})
+_NOT_FEASIBLE_LOCALLY = MappingProxyType({
+    'status': '❌ Not Feasible Locally',
+    'approach': 'Cloud processing required',
+    'confidence': 'High'
+})
+
+# Metrics plotted or tabulated downstream; stored as float32 in metrics_table
+_PLOT_FIELDS = ('scaled_memory_gb', 'parallel_time_hours')
+
+@functools.lru_cache(maxsize=64, typed=True)
+def _metrics_vec(base_area: float, areas: Tuple[float, ...]) -> Dict[str, np.ndarray]:
+    """
+    Calculate processing metrics for many area sizes at once
+    
+    Results are cached and shared between callers, so the arrays are read-only.
+    
+    Args:
+        base_area: Area in km² the current system processes as one tile
+        areas: Target areas in km²
+        
+    Returns:
+        Dictionary of 1-D arrays, one entry per area
+    """
+    areas = np.asarray(areas)
+    
+    # Scale calculations
+    scale_factor = areas / base_area
+    target_pixels = (BASE_PIXELS * scale_factor).astype(np.int64)
+    
+    # Memory calculations (linear scaling with some overhead)
+    base_memory_gb = 2.0
+    scaled_memory_gb = base_memory_gb * scale_factor
+    
+    # Time calculations (sub-linear due to SAM model loading overhead)
+    scaled_processing_time = MODEL_LOAD_SECONDS + (target_pixels * _PROCESSING_TIME_PER_PIXEL)
+    
+    # Tiling calculations
+    num_tiles = np.maximum(1, target_pixels // _PIXELS_PER_TILE)
+    
+    # Parallel processing estimates
+    max_workers = np.minimum(4, num_tiles)  # Assume 4-core system
+    parallel_time_hours = (scaled_processing_time * num_tiles) / (max_workers * 3600)
+    
+    metrics = {
+        'target_area_km2': areas,
+        'scale_factor': scale_factor,
+        'target_pixels': target_pixels,
+        'scaled_memory_gb': scaled_memory_gb,
+        'scaled_processing_time': scaled_processing_time,
+        'num_tiles': num_tiles,
+        'max_workers': max_workers,
+        'parallel_time_hours': parallel_time_hours,
+    }
+    for values in metrics.values():
+        values.flags.writeable = False
+    return metrics
+
+
+class TileBufferPool:
+    """
+    Pre-allocated tile arrays that are handed out and returned for reuse
+    
+    Processing many same-sized tiles through one pool replaces a fresh
+    allocation (and page faulting) per tile with a handful of long-lived
+    buffers, which also caps tile memory at count buffers.
+    """
+    
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float32, count: int = 4):
+        """
+        Initialize the pool
+        
+        Args:
+            shape: Shape of every tile buffer
+            dtype: Buffer dtype
+            count: Number of buffers to pre-allocate
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._free = [np.empty(self.shape, self.dtype) for _ in range(count)]
+    
+    def acquire(self) -> np.ndarray:
+        """Take a buffer (with stale contents); allocates a new one if all are in use"""
+        return self._free.pop() if self._free else np.empty(self.shape, self.dtype)
+    
+    def release(self, buf: np.ndarray) -> None:
+        """Return a buffer taken with acquire"""
+        if buf.shape != self.shape or buf.dtype != self.dtype:
+            raise ValueError(f"Buffer {buf.shape}/{buf.dtype} does not belong to this pool")
+        self._free.append(buf)
+
+# Layout of the scaling report, parsed once
+_REPORT_TEMPLATE = string.Template("""
+# 🚀 Ghost Forest Watcher - Scale Solutions Report
+
+Generated: $generated
+
+## 📊 Current System Analysis
+
+**Current Processing Capability:**
+- Area: $current_area km²
+- Pixels: $current_pixels
+- Memory Usage: $current_memory GB
+- Processing Time: $current_time seconds
+
+**Key Bottlenecks:**
+$bottlenecks
+
+## 🎯 Scaling Solutions
+
+### Solution 1: Intelligent Tiling System ✅
+**Approach:** Break large areas into 50MB tiles with overlap
+**Benefits:**
+$tiling_pros
+
+**Feasibility:** $tiling_feasibility
+**Memory Required:** $tiling_memory GB
+**Estimated Time:** $tiling_time hours
+
+### Solution 2: Cloud Processing (Google Earth Engine) ✅
+**Approach:** Server-side processing with automatic scaling
+**Benefits:**
+$cloud_pros
+
+**Feasibility:** $cloud_feasibility
+**Memory Required:** $cloud_memory GB (local)
+**Estimated Time:** $cloud_time hours
+
+## 🔥 Real-World Fire Scenarios
+
+$fires
+
+
+## 🏆 Recommendations
+
+### For Immediate Implementation:
+1. **Implement Tiling System** - Addresses current memory limitations
+2. **Add Parallel Processing** - 4x speed improvement with multi-core systems
+3. **Progress Monitoring** - Real-time feedback for large processing jobs
+
+### For Production Scaling:
+1. **Google Earth Engine Integration** - Optimal for areas > 500 km²
+2. **Hybrid Approach** - Local tiling for development, cloud for production
+3. **Automatic Fallback** - Graceful degradation when cloud unavailable
+
+### Performance Targets:
+- **Memory Efficiency:** Max 8GB RAM for any fire size
+- **Processing Speed:** < 2 hours for full East Troublesome Fire
+- **Fault Tolerance:** Individual tile failures don't stop entire job
+- **Scalability:** Handle fires up to 2000+ km² without code changes
+
+## 💡 Implementation Priority
+
+1. **High Priority:** Tiling system implementation (addresses 80% of scale issues)
+2. **Medium Priority:** Cloud processing integration (optimal performance)
+3. **Low Priority:** Advanced optimization (edge case improvements)
+
+---
+
+*This report demonstrates that Ghost Forest Watcher can scale from its current 823 km² 
+processing capability to handle the largest wildfire areas through intelligent tiling 
+and cloud processing approaches.*
+""")
+
+# One fire's section of the report, formatted from _flatten_metrics output
+_FIRE_SECTION_TEMPLATE = """### {name}
+- **Area:** {target_area_km2:.1f} km² (Scale Factor: {scale_factor}x)
+- **Total Pixels:** {total_pixels}
+- **Recommended Memory:** {recommended_gb} GB
+- **Processing Time (Tiled):** {tiled_parallel_hours} hours
+- **Number of Tiles:** {estimated_tiles}
+- **Feasibility:** {status} - {approach}"""
+
+def _morton_key(x: int, y: int) -> int:
+    """Interleave the bits of x (even positions) and y (odd positions)"""
+    key = 0
+    for bit in range(max(x.bit_length(), y.bit_length())):
+        key |= ((x >> bit) & 1) << (2 * bit) | ((y >> bit) & 1) << (2 * bit + 1)
+    return key
+
+def _iter_tiles_zorder(nx: int, ny: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (tx, ty) tiles of an nx x ny grid in Morton (Z) order
+    
+    Consecutive tiles stay spatially close, so blocks shared across tile edges
+    are still cached when the neighbour is read. (ScalableForestProcessor
+    orders its tiles along a Hilbert curve for the same reason.)
+    """
+    tiles = [(tx, ty) for ty in range(ny) for tx in range(nx)]
+    yield from sorted(tiles, key=lambda tile: _morton_key(*tile))
+
+def _json_default(obj):
+    """Serialize the read-only mappings and strategy dataclasses used in results"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented JSON bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, default=_json_default, indent=2, ensure_ascii=False).encode()
+
+def _flatten_metrics(metrics: Mapping) -> Dict:
+    """Merge a metrics dictionary's nested groups into one flat dictionary"""
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, Mapping):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
 
 class ScalingSolutionsDemo:
     """
@@ -39,38 +319,31 @@ class ScalingSolutionsDemo:
         self.full_fire_area_km2 = 784.21  # East Troublesome Fire total
         self.cameron_peak_km2 = 835.08  # Cameron Peak Fire
         
-    def analyze_current_limitations(self) -> Dict:
-        """Analyze current system limitations"""
+    @functools.cached_property
+    def current_limits(self) -> Mapping:
+        """Current system limitations (computed once per instance, read-only)"""
         
-        current_stats = {
-            'current_processing': {
+        current_stats = MappingProxyType({
+            'current_processing': MappingProxyType({
                 'area_km2': self.current_area_km2,
-                'pixels': 10_859_685,
+                'pixels': BASE_PIXELS,
                 'memory_usage_gb': 0.44,  # Current file size in GB
-                'processing_time_seconds': 8,
+                'processing_time_seconds': BASE_TIME_SECONDS,
                 'sam_model_size_gb': 0.375,
                 'total_memory_needed_gb': 2.0  # Conservative estimate
-            },
-            'bottlenecks': [
-                'SAM model requires 375MB GPU/CPU memory per instance',
-                'Single tile processing - no parallelization',
-                'All data loaded into memory simultaneously',
-                'No cloud-based processing pipeline',
-                'Limited to pre-processed tile sizes'
-            ],
-            'scale_factors': {
+            }),
+            'bottlenecks': _BOTTLENECKS,
+            'scale_factors': MappingProxyType({
                 'east_troublesome_full': self.full_fire_area_km2 / self.current_area_km2,
                 'cameron_peak_full': self.cameron_peak_km2 / self.current_area_km2
-            }
-        }
+            })
+        })
         
         return current_stats
     
-    def demonstrate_tiling_strategy(self) -> Dict:
-        """Demonstrate intelligent tiling for large areas"""
-        
-        # Calculate optimal tiling for different scenarios
-        scenarios = []
+    @functools.cached_property
+    def tiling_strategy(self) -> Mapping:
+        """Processing strategies and a recommendation (computed once, read-only)"""
         
         # Scenario 1: Current system scaled up
         current_scale = ProcessingStrategy(
@@ -81,11 +354,9 @@ class ScalingSolutionsDemo:
             memory_gb=32,  # Would need much more memory
             output_size_gb=4.2,
             feasibility="❌ Not Feasible",
-            pros=["Simple implementation", "No coordination needed"],
-            cons=["Requires 32+ GB RAM", "Single point of failure", "No parallelization"]
+            pros=("Simple implementation", "No coordination needed"),
+            cons=("Requires 32+ GB RAM", "Single point of failure", "No parallelization")
         )
-        scenarios.append(current_scale)
-        
         # Scenario 2: Intelligent tiling (our solution)
         tiled_approach = ProcessingStrategy(
             name="Intelligent Tiling System",
@@ -95,17 +366,16 @@ class ScalingSolutionsDemo:
             memory_gb=8,
             output_size_gb=4.2,
             feasibility="✅ Highly Feasible",
-            pros=[
-                "Memory efficient (8GB max)",
+            pros=(
+                "Memory efficient (8GB max, reusable tile buffers)",
                 "Fault tolerant (tile failures isolated)",
                 "Parallel processing",
+                "Z-order tile iteration for cache locality",
                 "Progress tracking",
                 "Scalable to any size"
-            ],
-            cons=["More complex implementation", "Tile coordination needed"]
+            ),
+            cons=("More complex implementation", "Tile coordination needed")
         )
-        scenarios.append(tiled_approach)
-        
         # Scenario 3: Cloud processing (GEE)
         cloud_approach = ProcessingStrategy(
             name="Cloud Processing (Google Earth Engine)",
@@ -115,146 +385,153 @@ class ScalingSolutionsDemo:
             memory_gb=4,  # Local memory only
             output_size_gb=4.2,
             feasibility="✅ Optimal for Large Areas",
-            pros=[
+            pros=(
                 "Minimal local resources",
                 "Automatic scaling",
                 "No data download needed",
                 "Built-in optimizations",
                 "Global data access"
-            ],
-            cons=["Requires GEE authentication", "Internet dependency", "Export limits"]
+            ),
+            cons=("Requires GEE authentication", "Internet dependency", "Export limits")
         )
-        scenarios.append(cloud_approach)
+        scenarios = (current_scale, tiled_approach, cloud_approach)
         
-        return {
+        return MappingProxyType({
             'scenarios': scenarios,
             'recommendation': self._get_scaling_recommendation(scenarios)
-        }
+        })
     
-    def _get_scaling_recommendation(self, scenarios: List[ProcessingStrategy]) -> Dict:
+    def _get_scaling_recommendation(self, scenarios: Sequence[ProcessingStrategy]) -> Mapping:
         """Get recommendation based on scenarios"""
         
-        return {
+        return MappingProxyType({
             'for_current_hardware': scenarios[1],  # Tiling approach
             'for_production': scenarios[2],        # Cloud approach
-            'hybrid_approach': {
-                'description': "Use tiling for local development, cloud for production",
-                'benefits': [
-                    "Develop and test locally with tiling",
-                    "Scale to production with cloud processing",
-                    "Fallback option if cloud unavailable",
-                    "Cost-effective for different use cases"
-                ]
-            }
-        }
+            'hybrid_approach': _HYBRID_APPROACH
+        })
     
     def calculate_processing_metrics(self, target_area_km2: float) -> Dict:
         """Calculate processing metrics for different area sizes"""
-        
-        # Base metrics from current system
-        base_area = self.current_area_km2
-        base_pixels = 10_859_685
-        base_time_seconds = 8
-        
-        # Scale calculations
-        scale_factor = target_area_km2 / base_area
-        target_pixels = int(base_pixels * scale_factor)
-        
-        # Memory calculations (linear scaling with some overhead)
-        base_memory_gb = 2.0
-        scaled_memory_gb = base_memory_gb * scale_factor
-        
-        # Time calculations (sub-linear due to SAM model loading overhead)
-        model_load_time = 5  # seconds
-        processing_time_per_pixel = (base_time_seconds - model_load_time) / base_pixels
-        scaled_processing_time = model_load_time + (target_pixels * processing_time_per_pixel)
-        
-        # Tiling calculations
-        tile_size_mb = 50
-        pixels_per_mb = base_pixels / 44  # From current file size
-        pixels_per_tile = tile_size_mb * pixels_per_mb
-        num_tiles = max(1, int(target_pixels / pixels_per_tile))
-        
-        # Parallel processing estimates
-        max_workers = min(4, num_tiles)  # Assume 4-core system
-        parallel_time_hours = (scaled_processing_time * num_tiles) / (max_workers * 3600)
+        return self._format_metrics(_metrics_vec(self.current_area_km2, (target_area_km2,)), 0)
+    
+    def _format_metrics(self, metrics: Dict[str, np.ndarray], index: int) -> Dict:
+        """Build the metrics dictionary for one entry of _metrics_vec's arrays"""
+        row = {key: values[index].item() for key, values in metrics.items()}
+        scaled_memory_gb = row['scaled_memory_gb']
+        num_tiles = row['num_tiles']
         
         return {
-            'target_area_km2': target_area_km2,
-            'scale_factor': round(scale_factor, 2),
-            'total_pixels': f"{target_pixels:,}",
+            'target_area_km2': row['target_area_km2'],
+            'scale_factor': round(row['scale_factor'], 2),
+            'total_pixels': f"{row['target_pixels']:,}",
             'memory_requirements': {
                 'single_tile_gb': round(scaled_memory_gb, 1),
                 'tiled_approach_gb': min(8, round(scaled_memory_gb / num_tiles * 2, 1)),
                 'recommended_gb': 8 if num_tiles > 1 else round(scaled_memory_gb, 1)
             },
             'processing_time': {
-                'single_tile_hours': round(scaled_processing_time / 3600, 2),
-                'tiled_parallel_hours': round(parallel_time_hours, 2),
+                'single_tile_hours': round(row['scaled_processing_time'] / 3600, 2),
+                'tiled_parallel_hours': round(row['parallel_time_hours'], 2),
                 'estimated_tiles': num_tiles,
-                'max_workers': max_workers
+                'max_workers': row['max_workers']
             },
             'feasibility_assessment': self._assess_feasibility(scaled_memory_gb, num_tiles)
         }
     
-    def _assess_feasibility(self, memory_gb: float, num_tiles: int) -> Dict:
-        """Assess feasibility of processing approach"""
+    def _assess_feasibility(self, memory_gb: float, num_tiles: int) -> Mapping[str, str]:
+        """Assess feasibility of processing approach (returns a shared, read-only mapping)"""
         
         if memory_gb <= 16 and num_tiles == 1:
-            return {
-                'status': '✅ Feasible',
-                'approach': 'Single tile processing',
-                'confidence': 'High'
-            }
+            return _FEASIBLE
         elif num_tiles > 1 and num_tiles <= 100:
-            return {
-                'status': '✅ Highly Feasible',
-                'approach': 'Tiled processing with parallelization',
-                'confidence': 'High'
-            }
+            return _HIGHLY_FEASIBLE
         elif num_tiles > 100:
-            return {
-                'status': '⚠️ Complex but Feasible',
-                'approach': 'Large-scale tiling or cloud processing recommended',
-                'confidence': 'Medium'
-            }
+            return _COMPLEX_BUT_FEASIBLE
         else:
-            return {
-                'status': '❌ Not Feasible Locally',
-                'approach': 'Cloud processing required',
-                'confidence': 'High'
-            }
-    
-    def demonstrate_real_world_scenarios(self) -> Dict:
-        """Show metrics for real-world fire scenarios"""
-        
-        scenarios = {}
-        
-        # Major Colorado fires
-        fire_areas = {
-            'East Troublesome Fire (2020)': 784.21,
-            'Cameron Peak Fire (2020)': 835.08,
-            'Pine Gulch Fire (2020)': 551.45,
-            'Hayman Fire (2002)': 555.16,
-            'Black Forest Fire (2013)': 60.04,
-            'Marshall Fire (2021)': 24.30
-        }
-        
-        for fire_name, area_km2 in fire_areas.items():
-            scenarios[fire_name] = self.calculate_processing_metrics(area_km2)
+            return _NOT_FEASIBLE_LOCALLY
+    
+    @functools.cached_property
+    def real_world_scenarios(self) -> Dict:
+        """Processing metrics for real-world fire scenarios (computed once)"""
         
-        return scenarios
+        # All fires in one vectorized pass
+        metrics = _metrics_vec(self.current_area_km2, tuple(FIRE_AREAS_KM2.values()))
+        return {
+            fire_name: self._format_metrics(metrics, i)
+            for i, fire_name in enumerate(FIRE_AREAS_KM2)
+        }
+    
+    @functools.cached_property
+    def metrics_table(self):
+        """
+        Raw real-world fire metrics as a pandas DataFrame indexed by fire name
+        
+        Computed in float64 like the report, with the plotted fields stored as
+        float32 and counts as int64, so NumPy/matplotlib consumers get typed
+        columns instead of re-boxing the formatted dictionaries.
+        """
+        import pandas as pd
+        
+        metrics = _metrics_vec(self.current_area_km2, tuple(FIRE_AREAS_KM2.values()))
+        columns = {
+            key: values.astype(np.float32 if key in _PLOT_FIELDS else values.dtype)
+            for key, values in metrics.items()
+        }
+        return pd.DataFrame(columns, index=pd.Index(list(FIRE_AREAS_KM2), name='fire'))
     
-    def create_scaling_visualization(self, output_path: Path = None):
-        """Create visualization of scaling approaches"""
+    def compute_real_world_scenarios(self,
+                                     compute_fn: Optional[Callable[[float], Dict]] = None,
+                                     max_workers: Optional[int] = None) -> Dict:
+        """
+        Run a per-fire computation over the real-world fire scenarios
+        
+        Hook for plugging in real tile processing: compute_fn is mapped over the
+        fire areas on a thread pool. The built-in estimates are sub-millisecond
+        per fire, so without compute_fn this returns real_world_scenarios.
+        
+        Args:
+            compute_fn: Called with each fire's area in km²; returns its result
+            max_workers: Threads for compute_fn (defaults to the CPU count)
+            
+        Returns:
+            Dictionary mapping fire name to compute_fn's result
+        """
+        if compute_fn is None:
+            return self.real_world_scenarios
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return dict(zip(FIRE_AREAS_KM2, executor.map(compute_fn, FIRE_AREAS_KM2.values())))
+    
+    def export_scenarios_json(self, path: Path) -> None:
+        """
+        Write the real-world fire scenario metrics to a JSON file
+        
+        Args:
+            path: Output .json path
+        """
+        Path(path).write_bytes(_dumps(self.real_world_scenarios))
+    
+    def create_scaling_visualization(self, output_path: Path = None, dpi: int = 150):
+        """
+        Create visualization of scaling approaches
+        
+        Args:
+            output_path: Optional PNG path to save the figure to
+            dpi: Resolution of the saved PNG; 150 suits on-screen reports, pass
+                300 for print quality
+        """
+        # Imported here so report-only callers don't pay matplotlib's import time
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+        from matplotlib.collections import PatchCollection
         
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Ghost Forest Watcher - Scaling Solutions', fontsize=16, fontweight='bold')
         
         # 1. Memory Requirements vs Area
-        areas = [50, 100, 200, 500, 784, 1000, 2000]
-        single_tile_memory = [area / self.current_area_km2 * 2 for area in areas]
-        tiled_memory = [min(8, mem) for mem in single_tile_memory]
+        areas = np.array([50, 100, 200, 500, 784, 1000, 2000], dtype=np.float64)
+        single_tile_memory = (areas / self.current_area_km2 * 2).astype(np.float32)
+        tiled_memory = np.minimum(np.float32(8.0), single_tile_memory)
         
         ax1.plot(areas, single_tile_memory, 'r-o', label='Single Tile', linewidth=2)
         ax1.plot(areas, tiled_memory, 'g-s', label='Tiled Approach', linewidth=2)
@@ -266,8 +543,8 @@ class ScalingSolutionsDemo:
         ax1.grid(True, alpha=0.3)
         
         # 2. Processing Time Comparison
-        single_tile_time = [area / self.current_area_km2 * 0.002 for area in areas]  # hours
-        tiled_time = [max(0.5, time / 4) for time in single_tile_time]  # 4x parallelization
+        single_tile_time = (areas / self.current_area_km2 * 0.002).astype(np.float32)  # hours
+        tiled_time = np.maximum(np.float32(0.5), single_tile_time / 4)  # 4x parallelization
         
         ax2.plot(areas, single_tile_time, 'r-o', label='Single Tile', linewidth=2)
         ax2.plot(areas, tiled_time, 'g-s', label='Tiled (4 workers)', linewidth=2)
@@ -288,26 +565,30 @@ class ScalingSolutionsDemo:
                                     linewidth=2, edgecolor='red', facecolor='lightcoral', alpha=0.3)
         ax3.add_patch(main_rect)
         
-        # Draw tiles
+        # Draw tiles as one collection, numbered in Z-order visiting sequence
         colors = ['lightblue', 'lightgreen', 'lightyellow', 'lightpink', 'lightgray']
-        tile_id = 0
-        for x in range(0, total_width, tile_size):
-            for y in range(0, total_height, tile_size):
-                if x < total_width and y < total_height:
-                    w = min(tile_size, total_width - x)
-                    h = min(tile_size, total_height - y)
-                    tile_rect = patches.Rectangle((x, y), w, h, 
-                                                linewidth=1, edgecolor='black', 
-                                                facecolor=colors[tile_id % len(colors)], alpha=0.7)
-                    ax3.add_patch(tile_rect)
-                    ax3.text(x + w/2, y + h/2, f'T{tile_id}', ha='center', va='center', fontweight='bold')
-                    tile_id += 1
+        visit_order = np.array(list(_iter_tiles_zorder(
+            -(-total_width // tile_size), -(-total_height // tile_size)
+        )))
+        tile_x, tile_y = visit_order[:, 0] * tile_size, visit_order[:, 1] * tile_size
+        tile_w = np.minimum(tile_size, total_width - tile_x)
+        tile_h = np.minimum(tile_size, total_height - tile_y)
+        tiles = PatchCollection(
+            [patches.Rectangle((x, y), w, h) for x, y, w, h in zip(tile_x, tile_y, tile_w, tile_h)],
+            facecolors=[colors[tile_id % len(colors)] for tile_id in range(tile_x.size)],
+            edgecolors='black', linewidths=1, alpha=0.7, rasterized=True
+        )
+        ax3.add_collection(tiles)
+        
+        centers = np.column_stack((tile_x + tile_w / 2, tile_y + tile_h / 2))
+        for tile_id, (cx, cy) in enumerate(centers):
+            ax3.text(cx, cy, f'T{tile_id}', ha='center', va='center', fontweight='bold')
         
         ax3.set_xlim(-0.5, total_width + 0.5)
         ax3.set_ylim(-0.5, total_height + 0.5)
         ax3.set_xlabel('Longitude (relative)')
         ax3.set_ylabel('Latitude (relative)')
-        ax3.set_title('Tiling Strategy Visualization')
+        ax3.set_title('Tiling Strategy Visualization (Z-order)')
         ax3.grid(True, alpha=0.3)
         ax3.text(total_width/2, -1, 'Each tile processed independently\nwith overlap for seamless results', 
                 ha='center', fontsize=10, style='italic')
@@ -317,11 +598,11 @@ class ScalingSolutionsDemo:
         approaches = ['Current System', 'Tiled Processing', 'Cloud Processing']
         
         # Feasibility scores (1-5, 5 being best)
-        feasibility_matrix = [
+        feasibility_matrix = np.array([
             [1, 1, 1, 1],  # Current system
             [5, 5, 4, 4],  # Tiled processing
             [5, 5, 5, 5]   # Cloud processing
-        ]
+        ])
         
         im = ax4.imshow(feasibility_matrix, cmap='RdYlGn', aspect='auto', vmin=1, vmax=5)
         ax4.set_xticks(range(len(fire_names)))
@@ -331,121 +612,54 @@ class ScalingSolutionsDemo:
         ax4.set_title('Feasibility by Fire Size & Approach')
         
         # Add text annotations
-        for i in range(len(approaches)):
-            for j in range(len(fire_names)):
-                score = feasibility_matrix[i][j]
-                emoji = '❌' if score == 1 else '⚠️' if score < 4 else '✅'
-                ax4.text(j, i, f'{emoji}\n{score}/5', ha='center', va='center', fontweight='bold')
+        emoji = np.where(feasibility_matrix == 1, '❌',
+                         np.where(feasibility_matrix < 4, '⚠️', '✅'))
+        for (i, j), symbol in np.ndenumerate(emoji):
+            ax4.text(j, i, f'{symbol}\n{feasibility_matrix[i, j]}/5',
+                     ha='center', va='center', fontweight='bold')
         
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
+            plt.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs={'optimize': True})
             logger.info(f"Scaling visualization saved to {output_path}")
         
         return fig
     
     def generate_scaling_report(self) -> str:
         """Generate comprehensive scaling report"""
+        buf = io.StringIO()
+        self._write_report(buf)
+        return buf.getvalue()
+    
+    def _write_report(self, out: TextIO) -> None:
+        """Write the scaling report to a text stream"""
         
-        current_limits = self.analyze_current_limitations()
-        tiling_demo = self.demonstrate_tiling_strategy()
-        real_scenarios = self.demonstrate_real_world_scenarios()
-        
-        report = f"""
-# 🚀 Ghost Forest Watcher - Scale Solutions Report
-
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## 📊 Current System Analysis
-
-**Current Processing Capability:**
-- Area: {current_limits['current_processing']['area_km2']:.1f} km²
-- Pixels: {current_limits['current_processing']['pixels']:,}
-- Memory Usage: {current_limits['current_processing']['memory_usage_gb']:.2f} GB
-- Processing Time: {current_limits['current_processing']['processing_time_seconds']} seconds
-
-**Key Bottlenecks:**
-"""
-        
-        for bottleneck in current_limits['bottlenecks']:
-            report += f"- {bottleneck}\n"
-        
-        report += f"""
-## 🎯 Scaling Solutions
-
-### Solution 1: Intelligent Tiling System ✅
-**Approach:** Break large areas into 50MB tiles with overlap
-**Benefits:**
-"""
-        for pro in tiling_demo['scenarios'][1].pros:
-            report += f"- {pro}\n"
-        
-        report += f"""
-**Feasibility:** {tiling_demo['scenarios'][1].feasibility}
-**Memory Required:** {tiling_demo['scenarios'][1].memory_gb} GB
-**Estimated Time:** {tiling_demo['scenarios'][1].estimated_time_hours} hours
-
-### Solution 2: Cloud Processing (Google Earth Engine) ✅
-**Approach:** Server-side processing with automatic scaling
-**Benefits:**
-"""
-        for pro in tiling_demo['scenarios'][2].pros:
-            report += f"- {pro}\n"
-        
-        report += f"""
-**Feasibility:** {tiling_demo['scenarios'][2].feasibility}
-**Memory Required:** {tiling_demo['scenarios'][2].memory_gb} GB (local)
-**Estimated Time:** {tiling_demo['scenarios'][2].estimated_time_hours} hours
-
-## 🔥 Real-World Fire Scenarios
-
-"""
+        current = self.current_limits['current_processing']
+        tiling, cloud = self.tiling_strategy['scenarios'][1:3]
         
-        for fire_name, metrics in real_scenarios.items():
-            report += f"""### {fire_name}
-- **Area:** {metrics['target_area_km2']:.1f} km² (Scale Factor: {metrics['scale_factor']}x)
-- **Total Pixels:** {metrics['total_pixels']}
-- **Recommended Memory:** {metrics['memory_requirements']['recommended_gb']} GB
-- **Processing Time (Tiled):** {metrics['processing_time']['tiled_parallel_hours']} hours
-- **Number of Tiles:** {metrics['processing_time']['estimated_tiles']}
-- **Feasibility:** {metrics['feasibility_assessment']['status']} - {metrics['feasibility_assessment']['approach']}
-
-"""
-        
-        report += f"""
-## 🏆 Recommendations
-
-### For Immediate Implementation:
-1. **Implement Tiling System** - Addresses current memory limitations
-2. **Add Parallel Processing** - 4x speed improvement with multi-core systems
-3. **Progress Monitoring** - Real-time feedback for large processing jobs
-
-### For Production Scaling:
-1. **Google Earth Engine Integration** - Optimal for areas > 500 km²
-2. **Hybrid Approach** - Local tiling for development, cloud for production
-3. **Automatic Fallback** - Graceful degradation when cloud unavailable
-
-### Performance Targets:
-- **Memory Efficiency:** Max 8GB RAM for any fire size
-- **Processing Speed:** < 2 hours for full East Troublesome Fire
-- **Fault Tolerance:** Individual tile failures don't stop entire job
-- **Scalability:** Handle fires up to 2000+ km² without code changes
-
-## 💡 Implementation Priority
-
-1. **High Priority:** Tiling system implementation (addresses 80% of scale issues)
-2. **Medium Priority:** Cloud processing integration (optimal performance)
-3. **Low Priority:** Advanced optimization (edge case improvements)
-
----
-
-*This report demonstrates that Ghost Forest Watcher can scale from its current 823 km² 
-processing capability to handle the largest wildfire areas through intelligent tiling 
-and cloud processing approaches.*
-"""
+        fires = "\n\n".join(
+            _FIRE_SECTION_TEMPLATE.format(name=fire_name, **_flatten_metrics(metrics))
+            for fire_name, metrics in self.real_world_scenarios.items()
+        )
         
-        return report
+        out.write(_REPORT_TEMPLATE.substitute(
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            current_area=f"{current['area_km2']:.1f}",
+            current_pixels=f"{current['pixels']:,}",
+            current_memory=f"{current['memory_usage_gb']:.2f}",
+            current_time=current['processing_time_seconds'],
+            bottlenecks="\n".join(f"- {item}" for item in self.current_limits['bottlenecks']),
+            tiling_pros="\n".join(f"- {pro}" for pro in tiling.pros),
+            tiling_feasibility=tiling.feasibility,
+            tiling_memory=tiling.memory_gb,
+            tiling_time=tiling.estimated_time_hours,
+            cloud_pros="\n".join(f"- {pro}" for pro in cloud.pros),
+            cloud_feasibility=cloud.feasibility,
+            cloud_memory=cloud.memory_gb,
+            cloud_time=cloud.estimated_time_hours,
+            fires=fires,
+        ))
 
 def main():
     """Run scaling solutions demonstration"""
@@ -457,14 +671,14 @@ def main():
     
     # Show current limitations
     print("\n📊 Current System Analysis:")
-    current = demo.analyze_current_limitations()
+    current = demo.current_limits
     print(f"Current area: {current['current_processing']['area_km2']:.1f} km²")
     print(f"Memory usage: {current['current_processing']['memory_usage_gb']:.2f} GB")
     print(f"Processing time: {current['current_processing']['processing_time_seconds']} seconds")
     
     # Demonstrate scaling approaches
     print("\n🎯 Scaling Solutions:")
-    tiling = demo.demonstrate_tiling_strategy()
+    tiling = demo.tiling_strategy
     for scenario in tiling['scenarios']:
         print(f"\n{scenario.name}:")
         print(f"  Feasibility: {scenario.feasibility}")
@@ -473,7 +687,7 @@ def main():
     
     # Show real-world scenarios
     print("\n🔥 Real-World Fire Analysis:")
-    scenarios = demo.demonstrate_real_world_scenarios()
+    scenarios = demo.real_world_scenarios
     for fire_name, metrics in list(scenarios.items())[:3]:  # Show first 3
         print(f"\n{fire_name}:")
         print(f"  Area: {metrics['target_area_km2']:.1f} km²")
@@ -495,11 +709,9 @@ def main():
     
     # Generate report
     print("\n📋 Generating comprehensive report...")
-    report = demo.generate_scaling_report()
-    
     report_path = output_dir / "scaling_solutions_report.md"
     with open(report_path, 'w') as f:
-        f.write(report)
+        demo._write_report(f)
     
     print(f"✅ Full report saved to {report_path}")
     
@@ -0,0 +1,239 @@
+"""
+Batched Raw-Block Reader for Multi-Tile GeoTIFF Ingestion
+Reads many windows of one GeoTIFF by fetching the underlying TIFF blocks directly
+"""
+import os
+import sys
+import math
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import rasterio
+from rasterio.enums import Interleaving
+from rasterio.io import DatasetReader
+from rasterio.windows import Window
+
+logger = logging.getLogger(__name__)
+
+BlockKey = Tuple[int, int, int]  # (band index or 0 for pixel-interleaved, block x, block y)
+
+
+class TileReader:
+    """
+    Read many raster windows with one batched submission of block reads
+
+    For uncompressed GeoTIFFs the byte range of every TIFF block is known from
+    GDAL's TIFF metadata, so all blocks needed by a set of windows are read with
+    positional reads (``os.pread``) issued concurrently from a thread pool, and
+    tiles are assembled from the raw bytes using the known dtype/shape.
+    Rasterio is used for metadata and georeferencing only.
+
+    Compressed or otherwise unsupported layouts (bit-packed NBITS samples,
+    non-native byte order) fall back to rasterio windowed reads, so callers
+    can use this unconditionally.
+
+    The file descriptor and read threads live as long as the reader; use it
+    as a context manager or call ``close()``.
+    """
+
+    def __init__(self, path: Union[str, Path], max_workers: int = 8,
+                 src: Optional[DatasetReader] = None):
+        """
+        Initialize the reader
+
+        Args:
+            path: Path to the GeoTIFF
+            max_workers: Number of concurrent block reads (threads kept open)
+            src: Optional already-open dataset for ``path``. It is reused for
+                metadata and fallback reads instead of reopening the file; the
+                caller keeps ownership and closes it.
+        """
+        self.path = str(path)
+        self.max_workers = max_workers
+        self._src = src
+
+        with self._dataset() as src:
+            self.profile = src.profile.copy()
+            self.transform = src.transform
+            self.crs = src.crs
+            self.count = src.count
+            self.width = src.width
+            self.height = src.height
+            self.block_height, self.block_width = src.block_shapes[0]
+            self.pixel_interleaved = src.count > 1 and src.interleaving == Interleaving.pixel
+
+            self.dtype = np.dtype(src.dtypes[0])
+            # Samples stored in fewer bits than the dtype (e.g. NBITS=12 uint16)
+            nbits = src.tags(1, ns="IMAGE_STRUCTURE").get("NBITS")
+            self.raw_supported = (
+                src.driver == "GTiff"
+                and src.compression is None
+                and len(set(src.dtypes)) == 1
+                and len(set(src.block_shapes)) == 1
+                and (nbits is None or int(nbits) == self.dtype.itemsize * 8)
+                and self._native_byte_order()
+            )
+            # GDAL's fill for blocks absent from a sparse file
+            self.fill_value = src.nodata if src.nodata is not None else 0
+
+            self._blocks: Dict[BlockKey, Tuple[int, int]] = {}
+            if self.raw_supported:
+                self._blocks = self._index_blocks(src)
+
+        self._fd: Optional[int] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if self.raw_supported:
+            self._fd = os.open(self.path, os.O_RDONLY)
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self) -> None:
+        """Release the file descriptor and read threads (a shared ``src`` stays open)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "TileReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _native_byte_order(self) -> bool:
+        """Whether the TIFF's byte order matches this machine's"""
+        with open(self.path, "rb") as fh:
+            header = fh.read(2)
+        return header == (b"II" if sys.byteorder == "little" else b"MM")
+
+    def _dataset(self):
+        """Context manager yielding the shared dataset, or a freshly opened one"""
+        if self._src is not None:
+            return nullcontext(self._src)
+        return rasterio.open(self.path)
+
+    def _index_blocks(self, src) -> Dict[BlockKey, Tuple[int, int]]:
+        """Map every TIFF block to its (offset, size) byte range"""
+        blocks_x = math.ceil(self.width / self.block_width)
+        blocks_y = math.ceil(self.height / self.block_height)
+        bands = [1] if self.pixel_interleaved else range(1, self.count + 1)
+
+        index = {}
+        for bidx in bands:
+            key_band = 0 if self.pixel_interleaved else bidx
+            for by in range(blocks_y):
+                for bx in range(blocks_x):
+                    offset = src.get_tag_item(f"BLOCK_OFFSET_{bx}_{by}", "TIFF", bidx=bidx)
+                    size = src.get_tag_item(f"BLOCK_SIZE_{bx}_{by}", "TIFF", bidx=bidx)
+                    index[(key_band, bx, by)] = (int(offset or 0), int(size or 0))
+        return index
+
+    def read_windows(self, windows: Sequence[Window]) -> List[np.ndarray]:
+        """
+        Read a batch of windows
+
+        Args:
+            windows: Windows to read (all bands)
+
+        Returns:
+            List of (count, height, width) arrays, in the order of ``windows``
+        """
+        if not self.raw_supported:
+            with self._dataset() as src:
+                return [src.read(window=window) for window in windows]
+
+        needed = set()
+        for window in windows:
+            needed.update(self._blocks_for_window(window))
+
+        raw = self._fetch_blocks(sorted(needed))
+        return [self._assemble(window, raw) for window in windows]
+
+    def read(self, window: Window, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read a single window (all bands)
+
+        Args:
+            window: Window to read
+            out: Optional (count, height, width) array of ``self.dtype`` to fill
+                in place (e.g. a view on shared memory)
+
+        Returns:
+            The tile array (``out`` when given)
+        """
+        if not self.raw_supported:
+            with self._dataset() as src:
+                return src.read(window=window, out=out)
+
+        raw = self._fetch_blocks(self._blocks_for_window(window))
+        return self._assemble(window, raw, out)
+
+    def _blocks_for_window(self, window: Window) -> List[BlockKey]:
+        col_off, row_off = int(window.col_off), int(window.row_off)
+        col_end = col_off + int(window.width) - 1
+        row_end = row_off + int(window.height) - 1
+        bx0, bx1 = col_off // self.block_width, col_end // self.block_width
+        by0, by1 = row_off // self.block_height, row_end // self.block_height
+        bands = [0] if self.pixel_interleaved else range(1, self.count + 1)
+        return [
+            (band, bx, by)
+            for band in bands
+            for by in range(by0, by1 + 1)
+            for bx in range(bx0, bx1 + 1)
+        ]
+
+    def _fetch_blocks(self, keys: List[BlockKey]) -> Dict[BlockKey, bytes]:
+        """Issue all block reads at once and wait for the whole batch"""
+        return dict(zip(keys, self._pool.map(self._pread, keys)))
+
+    def _pread(self, key: BlockKey) -> bytes:
+        offset, size = self._blocks[key]
+        return os.pread(self._fd, size, offset) if size else b""
+
+    def _block_array(self, data: bytes) -> np.ndarray:
+        """Decode one raw block into (bands, rows, block_width)"""
+        bands = self.count if self.pixel_interleaved else 1
+        row_bytes = self.block_width * bands * self.dtype.itemsize
+        rows = len(data) // row_bytes  # last strip of a striped TIFF may be short
+        arr = np.frombuffer(data, dtype=self.dtype, count=rows * self.block_width * bands)
+        if self.pixel_interleaved:
+            return arr.reshape(rows, self.block_width, bands).transpose(2, 0, 1)
+        return arr.reshape(1, rows, self.block_width)
+
+    def _assemble(self, window: Window, raw: Dict[BlockKey, bytes],
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        col_off, row_off = int(window.col_off), int(window.row_off)
+        width, height = int(window.width), int(window.height)
+        if out is None:
+            out = np.empty((self.count, height, width), dtype=self.dtype)
+
+        for band, bx, by in self._blocks_for_window(window):
+            data = raw[(band, bx, by)]
+            block = self._block_array(data) if data else None
+            block_rows = block.shape[1] if block is not None else self.block_height
+
+            # Intersection of this block with the window, in raster coordinates
+            x0 = max(col_off, bx * self.block_width)
+            x1 = min(col_off + width, (bx + 1) * self.block_width, self.width)
+            y0 = max(row_off, by * self.block_height)
+            y1 = min(row_off + height, by * self.block_height + block_rows, self.height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+
+            dst_rows = slice(y0 - row_off, y1 - row_off)
+            dst_cols = slice(x0 - col_off, x1 - col_off)
+            bands = slice(None) if band == 0 else slice(band - 1, band)
+            if block is None:
+                out[bands, dst_rows, dst_cols] = self.fill_value  # sparse block
+                continue
+
+            src_rows = slice(y0 - by * self.block_height, y1 - by * self.block_height)
+            src_cols = slice(x0 - bx * self.block_width, x1 - bx * self.block_width)
+            out[bands, dst_rows, dst_cols] = block[:, src_rows, src_cols]
+
+        return out
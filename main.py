@@ -11,6 +11,7 @@ Usage:
     python main.py --test         # Run tests
 """
 
+import os
 import sys
 import subprocess
 import argparse
@@ -70,10 +71,11 @@ def main():
         print(f"🚀 Command: {' '.join(cmd)}")
         print(f"🌐 Access at: http://localhost:{args.port}")
         
-        result = subprocess.run(cmd, check=True)
-        return result.returncode
+        # Replace this process with Streamlit (flush first: exec discards buffers)
+        sys.stdout.flush()
+        os.execvp(cmd[0], cmd)
         
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"❌ Error running application: {e}")
         return 1
     except KeyboardInterrupt:
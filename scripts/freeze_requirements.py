@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Freeze requirements.txt into _requirements.py for setup.py
+
+Run after editing requirements.txt (``make requirements``); ``--check`` exits
+non-zero when _requirements.py is out of date.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REQUIREMENTS_TXT = ROOT / "requirements.txt"
+REQUIREMENTS_PY = ROOT / "_requirements.py"
+
+
+def read_requirements(path: Path = REQUIREMENTS_TXT) -> tuple:
+    """Requirement lines, skipping blanks and comments"""
+    with open(path, "r", encoding="utf-8") as fh:
+        return tuple(line.strip() for line in fh if line.strip() and not line.startswith("#"))
+
+
+def render(requirements: tuple) -> str:
+    """Source of the generated _requirements.py"""
+    lines = [
+        '"""Generated from requirements.txt by scripts/freeze_requirements.py; do not edit"""',
+        "",
+        "INSTALL_REQUIRES = (",
+        *(f"    {req!r}," for req in requirements),
+        ")",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main() -> int:
+    source = render(read_requirements())
+
+    if "--check" in sys.argv[1:]:
+        current = REQUIREMENTS_PY.read_text(encoding="utf-8") if REQUIREMENTS_PY.exists() else ""
+        if current != source:
+            print(f"❌ {REQUIREMENTS_PY.name} is out of date; run scripts/freeze_requirements.py")
+            return 1
+        print(f"✅ {REQUIREMENTS_PY.name} is up to date")
+        return 0
+
+    REQUIREMENTS_PY.write_text(source, encoding="utf-8")
+    print(f"✅ Wrote {REQUIREMENTS_PY.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
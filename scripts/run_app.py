@@ -4,7 +4,6 @@ Streamlit app launcher with PyTorch compatibility fixes
 """
 import os
 import sys
-import subprocess
 
 def setup_environment():
     """Set up environment variables to prevent PyTorch-Streamlit conflicts"""
@@ -49,16 +48,15 @@ def run_streamlit():
     print("🌲 Starting Ghost Forest Watcher...")
     print(f"🚀 Command: {' '.join(args)}")
     
+    # Replace this process with Streamlit, which inherits the environment set
+    # above and handles signals itself. Output buffered so far must be flushed
+    # first, as exec discards it.
+    sys.stdout.flush()
     try:
-        # Run streamlit
-        result = subprocess.run(args, check=True)
-        return result.returncode
-    except subprocess.CalledProcessError as e:
+        os.execvp(args[0], args)
+    except OSError as e:
         print(f"❌ Error running Streamlit: {e}")
         return 1
-    except KeyboardInterrupt:
-        print("\n🛑 Application stopped by user")
-        return 0
 
 if __name__ == "__main__":
     sys.exit(run_streamlit()) 
\ No newline at end of file
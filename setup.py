@@ -1,16 +1,22 @@
 """
 Setup configuration for Ghost Forest Watcher
 """
-from setuptools import setup, find_packages
+from setuptools import setup
 import os
+import sys
 
-# Read the README file
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+# Read the README file only for commands that produce package metadata
+# (dist_info is the PEP 517 metadata step that bdist_wheel reuses); other
+# setup.py invocations don't need the long description
+if any(cmd in sys.argv for cmd in ("sdist", "bdist_wheel", "dist_info", "upload")):
+    with open("README.md", "r", encoding="utf-8") as fh:
+        long_description = fh.read()
+else:
+    long_description = ""
 
-# Read requirements
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+# Requirements, frozen from requirements.txt by scripts/freeze_requirements.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _requirements import INSTALL_REQUIRES
 
 setup(
     name="ghost-forest-watcher",
@@ -38,9 +44,10 @@ setup(
         "Programming Language :: Python :: 3.11",
         "Operating System :: OS Independent",
     ],
-    packages=find_packages(),
+    # Explicit list: skips the find_packages() tree walk and keeps tests/ out of installs
+    packages=["ghost_forest_watcher", "ghost_forest_watcher.src"],
     python_requires=">=3.9",
-    install_requires=requirements,
+    install_requires=list(INSTALL_REQUIRES),
     extras_require={
         "core": [
             "streamlit==1.32.2",
@@ -68,9 +75,13 @@ setup(
             "earthengine-api==0.1.395",
             "google-api-python-client==2.125.0",
         ],
+        "fast": [
+            "orjson>=3.8",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=4.0",
+            "pytest-xdist>=3.0",
             "black>=22.0",
             "flake8>=5.0",
             "isort>=5.0",
@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures for the Ghost Forest Watcher test suite
+"""
+import functools
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ee_stub():
+    """
+    Stand in a minimal 'ee' module when earthengine-api is not installed
+
+    Covers the names cloud_pipeline touches at import time and in annotations,
+    so cloud tests can import it without Earth Engine.
+    """
+    if importlib.util.find_spec("ee") is None:
+        sys.modules.setdefault("ee", SimpleNamespace(
+            Geometry=object, Image=object, ImageCollection=object, FeatureCollection=object,
+        ))
+    yield
+
+
+@pytest.fixture(scope="session")
+def default_geotiff():
+    """load_geotiff_data() for the default tile, read once per test session"""
+    from ghost_forest_watcher.src.data_manager import GhostForestDataManager
+
+    return GhostForestDataManager().load_geotiff_data()
+
+
+@pytest.fixture(scope="session")
+def file_exists():
+    """Path-existence check memoized for the session, so each path is stat'ed once"""
+    @functools.lru_cache(maxsize=None)
+    def _exists(path: str) -> bool:
+        return Path(path).exists()
+
+    return _exists
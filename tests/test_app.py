@@ -1,41 +1,41 @@
 """
 Unit tests for Ghost Forest Watcher application
 """
+import importlib
+import importlib.util
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
+import time
 from pathlib import Path
-import pandas as pd
 import numpy as np
-
-# Add ghost_forest_watcher to path for imports
-sys.path.append('..')
+import pytest
+import rasterio
+from affine import Affine
 
 # Import modules to test  
 from ghost_forest_watcher.src.data_manager import GhostForestDataManager
 from ghost_forest_watcher.src.sam_processor import ForestSAMProcessor
 
+# Seeded mock inputs shared by the tests, built once per module
+_rng = np.random.default_rng(0)
+MOCK_NDVI = _rng.random((256, 256), dtype=np.float32) * 2 - 1  # NDVI-like values in [-1, 1)
+MOCK_IMAGE = _rng.integers(0, 256, (100, 100, 3), dtype=np.uint8)
+
 
 class TestGhostForestDataManager(unittest.TestCase):
     """Test cases for GhostForestDataManager"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.data_manager = GhostForestDataManager()
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared data manager once; the tests don't mutate it"""
+        cls.data_manager = GhostForestDataManager()
         
     def test_initialization(self):
         """Test that GhostForestDataManager initializes correctly"""
         self.assertIsInstance(self.data_manager, GhostForestDataManager)
         
-    def test_load_geotiff_data_with_default_path(self):
-        """Test GeoTIFF data loading with default path"""
-        # This will use the actual file if it exists, or return None if not
-        result = self.data_manager.load_geotiff_data()
-        
-        # Result should be either a dict with data or None
-        self.assertTrue(result is None or isinstance(result, dict))
-        
     def test_load_geotiff_data_nonexistent_file(self):
         """Test GeoTIFF data loading with non-existent file"""
         # Try to load a file that definitely doesn't exist
@@ -65,10 +65,7 @@ class TestGhostForestDataManager(unittest.TestCase):
         stats = self.data_manager.get_vegetation_health_stats(mock_classification)
 
         self.assertIsInstance(stats, dict)
-        self.assertIn('healthy', stats)
-        self.assertIn('stressed', stats)
-        self.assertIn('declining', stats)
-        self.assertIn('dead', stats)
+        self.assertLessEqual({'healthy', 'stressed', 'declining', 'dead'}, stats.keys())
         # Basic sanity checks
         self.assertEqual(stats['healthy']['pixels'], 600)
         self.assertAlmostEqual(stats['dead']['percent'], 5.0)
@@ -81,12 +78,21 @@ class TestGhostForestDataManager(unittest.TestCase):
         self.assertIsInstance(result, dict)
 
 
+@pytest.mark.slow
+@pytest.mark.skipif(os.getenv("GF_RUN_SLOW") != "1", reason="Slow tests disabled")
+def test_load_geotiff_data_with_default_path(default_geotiff):
+    """Test GeoTIFF data loading with default path"""
+    # Uses the actual file if it exists, or returns None/{} if not
+    assert default_geotiff is None or isinstance(default_geotiff, dict)
+
+
 class TestForestSAMProcessor(unittest.TestCase):
     """Test cases for ForestSAMProcessor"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.processor = ForestSAMProcessor()
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared processor once; the tests don't mutate it"""
+        cls.processor = ForestSAMProcessor()
         
     def test_initialization(self):
         """Test that ForestSAMProcessor initializes correctly"""
@@ -94,19 +100,26 @@ class TestForestSAMProcessor(unittest.TestCase):
         
     def test_ndvi_to_rgb(self):
         """Test NDVI to RGB conversion"""
-        # Create mock NDVI data
-        mock_ndvi = np.random.rand(256, 256)
-        
-        result = self.processor.ndvi_to_rgb(mock_ndvi)
+        result = self.processor.ndvi_to_rgb(MOCK_NDVI)
         
         self.assertIsNotNone(result)
         self.assertIsInstance(result, np.ndarray)
         self.assertEqual(result.shape, (256, 256, 3))
-        
+
+    @pytest.mark.slow
+    @pytest.mark.skipif(os.getenv("GF_RUN_SLOW") != "1", reason="Slow tests disabled")
+    def test_ndvi_to_rgb_torch_matches_numpy(self):
+        """Test the torch LUT colorization matches ndvi_to_rgb"""
+        import torch
+
+        result = self.processor.ndvi_to_rgb_torch(torch.from_numpy(MOCK_NDVI))
+
+        self.assertEqual(result.dtype, torch.uint8)
+        np.testing.assert_array_equal(result.numpy(), self.processor.ndvi_to_rgb(MOCK_NDVI))
+
     def test_classify_vegetation_health_mock_data(self):
         """Test vegetation health classification with mock data"""
-        # Mock NDVI data
-        mock_ndvi = np.random.rand(100, 100) * 2 - 1  # Random NDVI-like values
+        mock_ndvi = MOCK_NDVI[:100, :100]
         
         # Mock masks
         mock_masks = {
@@ -119,21 +132,77 @@ class TestForestSAMProcessor(unittest.TestCase):
         
     def test_generate_prompt_points(self):
         """Test prompt point generation"""
-        # Create mock image
-        mock_image = np.random.rand(100, 100, 3).astype(np.uint8)
+        points = self.processor.generate_prompt_points(MOCK_IMAGE)
         
-        points = self.processor.generate_prompt_points(mock_image)
-        
-        self.assertIsInstance(points, list)
-        if points:  # Only check if points were generated
-            self.assertIsInstance(points[0], tuple)
-            self.assertEqual(len(points[0]), 2)
+        self.assertIsInstance(points, np.ndarray)
+        self.assertEqual(points.shape, (25, 2))
+        # Grid stays inside the central 2/3 of the image
+        self.assertTrue(((points >= 100 // 6) & (points <= 5 * 100 // 6)).all())
+
+
+@pytest.fixture(scope="module")
+def processor():
+    """One ForestSAMProcessor for the module's pytest-style tests"""
+    return ForestSAMProcessor()
+
+
+def _best_time_ns(fn, repeat=3):
+    """Fastest of a few runs, to damp scheduler noise"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        times.append(time.perf_counter_ns() - start)
+    return min(times)
+
 
+def test_load_geotiff_reports_file_dtype(processor, tmp_path):
+    """Test data is decoded to float32 while metadata keeps the file's dtype"""
+    path = tmp_path / "ndvi_int16.tif"
+    data = np.arange(12, dtype=np.int16).reshape(1, 3, 4)
+    with rasterio.open(
+        path, "w", driver="GTiff", height=3, width=4, count=1, dtype="int16",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0),
+    ) as dst:
+        dst.write(data)
 
+    loaded, metadata = processor.load_geotiff(path)
+
+    assert loaded.dtype == np.float32
+    assert np.array_equal(loaded, data)
+    assert metadata['dtype'] == np.int16
+
+
+@pytest.mark.parametrize("n", [1, 4, 16])
+def test_ndvi_to_rgb_batch(processor, n):
+    """Test the batched conversion matches ndvi_to_rgb"""
+    stack = np.stack([MOCK_NDVI] * n)
+
+    result = processor.ndvi_to_rgb_batch(stack)
+
+    assert result.shape == (n, 256, 256, 3)
+    assert result.dtype == np.uint8
+    expected = processor.ndvi_to_rgb(MOCK_NDVI)
+    assert all(np.array_equal(rgb, expected) for rgb in result)
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(os.getenv("GF_RUN_SLOW") != "1", reason="Slow tests disabled")
+@pytest.mark.parametrize("n", [4, 16])
+def test_ndvi_to_rgb_batch_scaling(processor, n):
+    """Test the per-image cost stays roughly flat, i.e. no per-sample Python loop"""
+    stack = np.stack([MOCK_NDVI] * n)
+
+    t1 = _best_time_ns(lambda: processor.ndvi_to_rgb_batch(stack[:1]))
+    tn = _best_time_ns(lambda: processor.ndvi_to_rgb_batch(stack))
+    assert tn / n < 2 * t1
+
+
+@patch('streamlit.set_page_config')
 class TestApplicationIntegration(unittest.TestCase):
-    """Integration tests for the application"""
+    """Integration tests for the application (streamlit.set_page_config patched class-wide)"""
     
-    def test_required_files_check(self):
+    def test_required_files_check(self, mock_set_page_config):
         """Test that the application can check for required files"""
         data_file = Path("data/east_troublesome_small_tile.tif")
         model_file = Path("models/sam_vit_b.pth")
@@ -144,25 +213,19 @@ class TestApplicationIntegration(unittest.TestCase):
         self.assertIsInstance(model_file, Path)
         self.assertIsInstance(results_file, Path)
         
-    def test_app_imports(self):
+    def test_app_imports(self, mock_set_page_config):
         """Test that all necessary modules can be imported"""
-        try:
-            import streamlit
-            import folium
-            import plotly.express
-            import pandas
-            import numpy
-            import_success = True
-        except ImportError:
-            import_success = False
-            
-        self.assertTrue(import_success, "Required packages should be importable")
-        
-    @patch('streamlit.set_page_config')
+        # find_spec locates the packages without running their (slow) import code
+        for module in ("streamlit", "folium", "plotly", "pandas", "numpy"):
+            self.assertIsNotNone(importlib.util.find_spec(module),
+                                 f"Required package {module} should be importable")
+        
     def test_streamlit_config(self, mock_set_page_config):
         """Test Streamlit page configuration"""
-        # Import the main app module from the correct path
-        import ghost_forest_watcher.app as app
+        # Re-import the app even if an earlier test already imported it, since
+        # set_page_config only runs at import time
+        sys.modules.pop('ghost_forest_watcher.app', None)
+        importlib.import_module('ghost_forest_watcher.app')
         
         # The set_page_config should have been called during import
         mock_set_page_config.assert_called_once()
@@ -207,27 +270,3 @@ class TestDataValidation(unittest.TestCase):
         # Test with empty dict
         stats = data_manager.get_vegetation_health_stats({})
         self.assertIsInstance(stats, dict)
-
-
-if __name__ == '__main__':
-    # Create test suite
-    suite = unittest.TestSuite()
-    
-    # Add test cases
-    suite.addTest(unittest.makeSuite(TestGhostForestDataManager))
-    suite.addTest(unittest.makeSuite(TestForestSAMProcessor))
-    suite.addTest(unittest.makeSuite(TestApplicationIntegration))
-    suite.addTest(unittest.makeSuite(TestDataValidation))
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    # Print summary
-    print(f"\n{'='*50}")
-    print(f"TEST SUMMARY:")
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success rate: {((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100):.1f}%")
-    print(f"{'='*50}") 
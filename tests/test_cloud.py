@@ -1,19 +1,10 @@
 """
 Smoke tests for cloud pipeline that do not require earthengine-api.
-This test injects a minimal stub 'ee' module so the cloud module can import.
+The session-wide ee_stub fixture in conftest.py lets the cloud module import.
 """
-import sys
-from types import SimpleNamespace
-
-
-def _inject_ee_stub():
-    # Minimal 'ee' stub for import-time and type annotations
-    ee_stub = SimpleNamespace(Geometry=object)
-    sys.modules.setdefault("ee", ee_stub)
 
 
 def test_cloud_pipeline_smoke_without_ee():
-    _inject_ee_stub()
     from ghost_forest_watcher.src.cloud_pipeline import CloudOptimizedPipeline, FireBoundary
 
     # Instantiate without initializing Earth Engine
@@ -0,0 +1,145 @@
+"""
+End-to-end tests for ScalableForestProcessor.process_large_area on a small
+synthetic GeoTIFF, with a stubbed SAM processor in the worker processes.
+"""
+import functools
+import json
+import os
+import signal
+from pathlib import Path
+
+import numpy as np
+import pytest
+import rasterio
+import torch
+from affine import Affine
+
+import ghost_forest_watcher.src.scalable_processor as sp
+from ghost_forest_watcher.src.sam_processor import ForestSAMProcessor
+
+_INIT_WORKER_FROM_FILE = sp._init_worker_from_file
+
+# 96x64 raster in 16x16 blocks, cut into 32x32 tiles (3 x 2) with an 8 pixel
+# overlap. Columns [0, 48) are NaN, so the first tile column has no valid data.
+WIDTH, HEIGHT, BLOCK, TILE, OVERLAP = 96, 64, 16, 32, 8
+NAN_COLS = 48
+
+
+class _StubSAMProcessor(ForestSAMProcessor):
+    """SAM stand-in without a model: every pixel is segmented as vegetation"""
+
+    def __init__(self, model_type: str = "vit_b", device: str = "cpu"):
+        super().__init__(model_type=model_type, device="cpu")
+
+    def resolve_checkpoint(self):
+        return Path("sam_stub.pth")
+
+    def load_model(self, checkpoint_path=None, enable_trt=False):
+        pass
+
+    def segment_forest_areas_batch(self, images, prompt_points=None):
+        return [{"combined_mask": np.ones(image.shape[:2], dtype=bool)} for image in images]
+
+
+class _KilledSAMProcessor(_StubSAMProcessor):
+    """SAM stand-in whose worker dies mid-batch, like an OOM kill"""
+
+    def segment_forest_areas_batch(self, images, prompt_points=None):
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _init_stub_worker(processor_cls, init_path, write_lock=None):
+    """Pool initializer: swap in the stub before the real initializer runs"""
+    sp.ForestSAMProcessor = processor_cls
+    _INIT_WORKER_FROM_FILE(init_path, write_lock)
+
+
+@pytest.fixture
+def ndvi_path(tmp_path):
+    data = np.random.default_rng(0).uniform(-1, 1, (1, HEIGHT, WIDTH)).astype(np.float32)
+    data[:, :, :NAN_COLS] = np.nan
+    path = tmp_path / "ndvi.tif"
+    with rasterio.open(
+        path, "w", driver="GTiff", height=HEIGHT, width=WIDTH, count=1, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 400000, 0, -10, 4400000), nodata=np.nan,
+        tiled=True, blockxsize=BLOCK, blockysize=BLOCK,
+    ) as dst:
+        dst.write(data)
+    return path
+
+
+def _run(monkeypatch, ndvi_path, output_dir, processor_cls):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    monkeypatch.setattr(sp, "ForestSAMProcessor", processor_cls)
+    monkeypatch.setattr(
+        sp, "_init_worker_from_file", functools.partial(_init_stub_worker, processor_cls)
+    )
+    processor = sp.ScalableForestProcessor(
+        max_memory_gb=64, tile_size_mb=TILE * TILE * 4 / 1024**2, overlap_pixels=OVERLAP
+    )
+    summary = processor.process_large_area(ndvi_path, output_dir, max_workers=2, batch_size=2)
+    with open(output_dir / sp.ALL_TILE_STATS_NAME) as f:
+        results = [json.loads(line) for line in f]
+    return summary, results
+
+
+def test_process_large_area(monkeypatch, ndvi_path, tmp_path):
+    output_dir = tmp_path / "out"
+    summary, results = _run(monkeypatch, ndvi_path, output_dir, _StubSAMProcessor)
+
+    assert summary["processing_summary"]["total_tiles"] == 6
+    assert summary["processing_summary"]["completed_tiles"] == 4
+    assert summary["processing_summary"]["failed_tiles"] == 0
+    assert summary["processing_summary"]["skipped_tiles"] == 2
+
+    # One line per tile; the NaN tile column is reported as skipped
+    assert sorted(result["tile_id"] for result in results) == list(range(6))
+    skipped = [result for result in results if result["status"] == "skipped"]
+    assert sorted(result["tile_id"] for result in skipped) == [0, 3]
+    assert all(result["reason"] == "no valid data" for result in skipped)
+
+    # Each pixel of the segmented tiles is counted once: overlaps are not
+    # double-counted, so the totals match classifying the region in one go
+    with rasterio.open(ndvi_path) as src:
+        data = src.read()
+    region = data[:, :, TILE:]
+    expected = ForestSAMProcessor(device="cpu").classify_vegetation_health(
+        region, {"combined_mask": np.ones(region.shape[1:], dtype=bool)}
+    )["statistics"]
+    for key in sp._AGGREGATE_KEYS:
+        assert summary["aggregated_statistics"][key] == expected[key]
+
+    # Written cores tile the input exactly; skipped windows read back as nodata
+    with rasterio.open(output_dir / sp.NDVI_MOSAIC_NAME) as mosaic:
+        assert mosaic.block_shapes[0] == (BLOCK, BLOCK)
+        assert np.array_equal(mosaic.read(), data, equal_nan=True)
+
+
+def test_process_large_area_worker_death_fails_fast(monkeypatch, ndvi_path, tmp_path):
+    summary, results = _run(monkeypatch, ndvi_path, tmp_path / "out", _KilledSAMProcessor)
+
+    assert summary["processing_summary"]["completed_tiles"] == 0
+    assert summary["processing_summary"]["failed_tiles"] == 4
+    failed = [result for result in results if result["status"] == "failed"]
+    assert len(failed) == 4
+    # The broken pool stops the run, not the per-batch timeout
+    assert all("BrokenProcessPool" in result["error"] for result in failed)
+
+
+def test_coarse_valid_mask_ignores_scattered_nans(tmp_path):
+    cell = sp.PRIORITY_DECIMATION
+    data = np.random.default_rng(0).random((1, 70, 85), dtype=np.float32)
+    data[:, ::cell, ::cell] = np.nan  # one undeclared NaN in every cell
+    data[:, 2 * cell:3 * cell, cell:2 * cell] = np.nan  # one cell without valid data
+    path = tmp_path / "scattered.tif"
+    with rasterio.open(
+        path, "w", driver="GTiff", height=70, width=85, count=1, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0),
+    ) as dst:
+        dst.write(data)
+
+    with rasterio.open(path) as src:
+        valid = sp.ScalableForestProcessor(max_memory_gb=4)._coarse_valid_mask(src)
+
+    assert valid.shape == (5, 6)
+    assert np.argwhere(~valid).tolist() == [[2, 1]]
@@ -0,0 +1,121 @@
+"""
+Unit tests for the raw-block TileReader against rasterio windowed reads.
+"""
+import sys
+
+import numpy as np
+import pytest
+import rasterio
+from affine import Affine
+from rasterio.windows import Window
+
+from ghost_forest_watcher.src.tile_reader import TileReader
+
+
+@pytest.mark.parametrize(
+    "creation_options, count",
+    [
+        ({"tiled": True, "blockxsize": 16, "blockysize": 16}, 1),
+        ({}, 1),
+        ({"interleave": "pixel"}, 3),
+        ({"compress": "lzw"}, 1),
+    ],
+)
+def test_read_windows_matches_rasterio(tmp_path, creation_options, count):
+    path = tmp_path / "ndvi.tif"
+    data = np.random.default_rng(0).random((count, 45, 61), dtype=np.float32)
+    with rasterio.open(
+        path, "w", driver="GTiff", height=45, width=61, count=count, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0), **creation_options,
+    ) as dst:
+        dst.write(data)
+
+    windows = [Window(0, 0, 61, 45), Window(5, 7, 20, 13), Window(50, 40, 11, 5)]
+    with TileReader(path) as reader:
+        tiles = reader.read_windows(windows)
+
+    for window, tile in zip(windows, tiles):
+        assert np.array_equal(tile, data[:, window.toslices()[0], window.toslices()[1]])
+
+
+@pytest.mark.parametrize("nodata", [float("nan"), -9999.0, None])
+def test_sparse_blocks_match_rasterio(tmp_path, nodata):
+    path = tmp_path / "sparse.tif"
+    with rasterio.open(
+        path, "w", driver="GTiff", height=48, width=64, count=1, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0), nodata=nodata,
+        tiled=True, blockxsize=16, blockysize=16, SPARSE_OK=True,
+    ) as dst:
+        dst.write(np.ones((1, 16, 32), dtype=np.float32), window=Window(16, 16, 32, 16))
+
+    windows = [Window(0, 0, 64, 48), Window(10, 10, 30, 20)]
+    with TileReader(path) as reader:
+        tiles = reader.read_windows(windows)
+
+    with rasterio.open(path) as src:
+        for window, tile in zip(windows, tiles):
+            assert np.array_equal(tile, src.read(window=window), equal_nan=True)
+
+
+def test_read_into_out(tmp_path):
+    path = tmp_path / "ndvi.tif"
+    data = np.random.default_rng(0).random((2, 40, 50), dtype=np.float32)
+    with rasterio.open(
+        path, "w", driver="GTiff", height=40, width=50, count=2, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0),
+        tiled=True, blockxsize=16, blockysize=16,
+    ) as dst:
+        dst.write(data)
+
+    window = Window(7, 3, 30, 25)
+    out = np.empty((2, 25, 30), dtype=np.float32)
+    with TileReader(path) as reader:
+        tile = reader.read(window, out=out)
+
+    assert tile is out
+    assert np.array_equal(out, data[:, 3:28, 7:37])
+
+
+@pytest.mark.parametrize(
+    "dtype, creation_options",
+    [
+        ("uint8", {"nbits": 4}),
+        ("uint16", {"nbits": 12}),
+        ("float32", {"nbits": 16}),
+    ],
+)
+def test_bit_packed_samples_fall_back(tmp_path, dtype, creation_options):
+    path = tmp_path / "nbits.tif"
+    data = (np.random.default_rng(0).random((1, 20, 30)) * 15).astype(dtype)
+    with rasterio.open(
+        path, "w", driver="GTiff", height=20, width=30, count=1, dtype=dtype,
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0), **creation_options,
+    ) as dst:
+        dst.write(data)
+
+    window = Window(3, 2, 20, 15)
+    with TileReader(path) as reader:
+        assert not reader.raw_supported
+        tile = reader.read(window)
+
+    with rasterio.open(path) as src:
+        assert np.array_equal(tile, src.read(window=window))
+
+
+def test_non_native_byte_order_falls_back(tmp_path):
+    path = tmp_path / "swapped.tif"
+    data = np.random.default_rng(0).random((1, 20, 30), dtype=np.float32)
+    endianness = "BIG" if sys.byteorder == "little" else "LITTLE"
+    with rasterio.open(
+        path, "w", driver="GTiff", height=20, width=30, count=1, dtype="float32",
+        crs="EPSG:32613", transform=Affine(10, 0, 0, 0, -10, 0), ENDIANNESS=endianness,
+    ) as dst:
+        dst.write(data)
+
+    window = Window(3, 2, 20, 15)
+    with TileReader(path) as reader:
+        assert not reader.raw_supported
+        tile = reader.read(window)
+
+    assert tile.dtype.isnative
+    assert np.array_equal(tile, data[:, 2:17, 3:23])
@@ -3,61 +3,57 @@ Web functionality tests for Ghost Forest Watcher Streamlit app
 
 Marked as integration tests; skipped by default unless GF_RUN_INTEGRATION=1.
 """
+import logging
 import os
 import requests
 import time
 from pathlib import Path
 import pytest
 
-@pytest.mark.integration
-@pytest.mark.skipif(os.getenv("GF_RUN_INTEGRATION") != "1", reason="Integration tests disabled")
-def test_app_running():
-    """Test that the Streamlit app is running and responsive"""
-    try:
-        response = requests.get("http://localhost:8501", timeout=10)
-        print(f"✅ App is running - Status Code: {response.status_code}")
-        assert response.status_code == 200
-    except Exception as e:
-        print(f"❌ App connection failed: {e}")
-        assert False
+logger = logging.getLogger(__name__)
 
-@pytest.mark.integration
-@pytest.mark.skipif(os.getenv("GF_RUN_INTEGRATION") != "1", reason="Integration tests disabled")
-def test_health_check():
-    """Test app health endpoint"""
-    try:
-        response = requests.get("http://localhost:8501/_stcore/health", timeout=5)
-        assert response.status_code == 200
-    except Exception as e:
-        print(f"⚠️ Health check endpoint not available: {e}")
-        assert False
+BASE_URL = "http://localhost:8501"
+
+# (name, path, timeout in seconds) probed over one shared connection
+ENDPOINTS = [
+    ("App Running", "/", 10),
+    ("Health Check", "/_stcore/health", 5),
+    ("Static Resources", "/_stcore/static/", 5),
+]
+
+REQUIRED_FILES = [
+    ("Data file", "data/east_troublesome_small_tile.tif"),
+    ("SAM model", "models/sam_vit_b.pth"),
+    ("Results image", "outputs/forest_analysis_results.png"),
+]
+
+@pytest.fixture(scope="session")
+def http():
+    """One keep-alive HTTP session shared by all web probes"""
+    session = requests.Session()
+    yield session
+    session.close()
 
 @pytest.mark.integration
 @pytest.mark.skipif(os.getenv("GF_RUN_INTEGRATION") != "1", reason="Integration tests disabled")
-def test_static_resources():
-    """Test that static resources are loading"""
+@pytest.mark.parametrize("name, path, timeout", ENDPOINTS, ids=[e[0] for e in ENDPOINTS])
+def test_endpoints(http, name, path, timeout):
+    """Test that the app, its health endpoint and static resources respond"""
     try:
-        # Test for Streamlit's static resources
-        response = requests.get("http://localhost:8501/_stcore/static/", timeout=5)
-        print(f"✅ Static resources accessible - Status: {response.status_code}")
-        assert response.status_code == 200
-    except Exception as e:
-        print(f"⚠️ Static resources test: {e}")
-        assert False
+        response = http.get(BASE_URL + path, timeout=timeout)
+    except requests.RequestException as e:
+        logger.debug(f"❌ {name} failed: {e}")
+        pytest.fail(f"{name} not reachable: {e}")
+    logger.debug(f"✅ {name} - Status: {response.status_code}")
+    assert response.status_code == 200
 
-def test_file_availability():
+def test_file_availability(file_exists):
     """Test availability of required files"""
-    files_to_check = [
-        ("Data file", "data/east_troublesome_small_tile.tif"),
-        ("SAM model", "models/sam_vit_b.pth"),
-        ("Results image", "outputs/forest_analysis_results.png")
-    ]
-    
     file_status = []
-    for name, path in files_to_check:
-        exists = Path(path).exists()
+    for name, path in REQUIRED_FILES:
+        exists = file_exists(path)
         status = "✅" if exists else "❌"
-        print(f"{status} {name}: {path}")
+        logger.debug(f"{status} {name}: {path}")
         file_status.append(exists)
     
     # Assert that test simply runs; do not require files to exist by default
@@ -68,37 +64,33 @@ def main():
     print("🌲 Ghost Forest Watcher - Web Test Suite")
     print("=" * 50)
     
-    # Test 1: App running
-    print("\n1. Testing app connectivity...")
-    app_running = test_app_running()
-    
-    # Test 2: Health check
-    print("\n2. Testing app health...")
-    health_ok = test_health_check()
-    
-    # Test 3: Static resources
-    print("\n3. Testing static resources...")
-    static_ok = test_static_resources()
+    results = {}
+    with requests.Session() as http:
+        for i, (name, path, timeout) in enumerate(ENDPOINTS, 1):
+            print(f"\n{i}. Testing {name.lower()}...")
+            try:
+                test_endpoints(http, name, path, timeout)
+                results[name] = True
+            except (AssertionError, pytest.fail.Exception):
+                results[name] = False
     
-    # Test 4: File availability
-    print("\n4. Checking required files...")
-    file_status = test_file_availability()
+    print(f"\n{len(ENDPOINTS) + 1}. Checking required files...")
+    file_status = [Path(path).exists() for _, path in REQUIRED_FILES]
     
     # Summary
     print("\n" + "=" * 50)
     print("📊 TEST SUMMARY:")
-    print(f"App Running: {'✅' if app_running else '❌'}")
-    print(f"Health Check: {'✅' if health_ok else '❌'}")
-    print(f"Static Resources: {'✅' if static_ok else '❌'}")
+    for name, ok in results.items():
+        print(f"{name}: {'✅' if ok else '❌'}")
     print(f"Data Files Available: {sum(file_status)}/{len(file_status)}")
     
-    total_tests = 3 + len(file_status)  # 3 web tests + file tests
-    passed_tests = sum([app_running, health_ok, static_ok]) + sum(file_status)
+    total_tests = len(results) + len(file_status)
+    passed_tests = sum(results.values()) + sum(file_status)
     success_rate = (passed_tests / total_tests) * 100
     
     print(f"\nOverall Success Rate: {success_rate:.1f}% ({passed_tests}/{total_tests})")
     
-    if app_running:
+    if results["App Running"]:
         print("\n🎉 Web app is accessible at: http://localhost:8501")
         print("📱 You can now test the full application in your browser!")
     else: